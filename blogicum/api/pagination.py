@@ -0,0 +1,135 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from blogicum.constants import API_MAX_PAGE_SIZE, API_PAGE_SIZE
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def encode_cursor(values):
+    # DjangoJSONEncoder округляет время до миллисекунд, а курсору
+    # нужно точное значение ключа.
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=lambda value: value.isoformat()).encode()
+    ).decode()
+
+
+def decode_cursor(queryset, ordering, cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequest('Некорректный курсор.')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise BadRequest('Некорректный курсор.')
+    try:
+        return [
+            queryset.model._meta.get_field(key.lstrip('-')).to_python(value)
+            for key, value in zip(ordering, values)
+        ]
+    except Exception:
+        raise BadRequest('Некорректный курсор.')
+
+
+def keyset_filter(ordering, values):
+    # (a, b) после (x, y) при сортировке по убыванию:
+    # a < x OR (a = x AND b < y).
+    conditions = []
+    for index, key in enumerate(ordering):
+        name = key.lstrip('-')
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        equal = {
+            previous.lstrip('-'): value
+            for previous, value in zip(ordering[:index], values)
+        }
+        conditions.append(Q(**equal, **{f'{name}__{lookup}': values[index]}))
+    return reduce(lambda left, right: left | right, conditions)
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('Параметр limit должен быть числом.')
+    if limit < 1:
+        raise BadRequest('Параметр limit должен быть положительным.')
+    return min(limit, API_MAX_PAGE_SIZE)
+
+
+def parse_fields(request, spec):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(spec)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(spec))
+    if unknown:
+        raise BadRequest(f'Неизвестные поля: {", ".join(unknown)}.')
+    return names
+
+
+def select(queryset, spec, names):
+    # Поле описывается путём для values_list или выражением для annotate:
+    # выражения вычисляются только если поле запрошено.
+    annotations = {
+        name: spec[name] for name in names
+        if not isinstance(spec[name], str)
+    }
+    paths = [
+        spec[name] if isinstance(spec[name], str) else name
+        for name in names
+    ]
+    return queryset.annotate(**annotations) if annotations else queryset, (
+        paths
+    )
+
+
+def serialize(names, row, converters):
+    item = dict(zip(names, row))
+    for name, convert in converters.items():
+        if name in item:
+            item[name] = convert(item[name])
+    return dumps(item)
+
+
+def stream_page(request, queryset, spec, ordering, converters=None):
+    converters = converters or {}
+    names = parse_fields(request, spec)
+    limit = parse_limit(request)
+    keys = [key.lstrip('-') for key in ordering]
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(
+            keyset_filter(ordering, decode_cursor(queryset, ordering, cursor))
+        )
+    queryset, paths = select(queryset, spec, names)
+    # Страница читается из базы до того, как ответ отдан: под ASGI
+    # потоковый ответ перебирается в цикле событий, где ORM недоступен.
+    # Потоком отдаётся только сериализация готовых кортежей.
+    rows = list(
+        queryset.order_by(*ordering).values_list(*paths, *keys)[:limit + 1]
+    )
+
+    def generate():
+        yield '{"results": ['
+        for index, row in enumerate(rows[:limit]):
+            yield (', ' if index else '') + serialize(
+                names, row[:len(names)], converters
+            )
+        next_url = None
+        if len(rows) > limit:
+            query = request.GET.copy()
+            query['cursor'] = encode_cursor(list(rows[limit - 1][len(names):]))
+            next_url = f'{request.path}?{query.urlencode()}'
+        yield f'], "next": {dumps(next_url)}}}'
+
+    return generate()
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from .views import category_list, comment_list, post_detail, post_list
+
+app_name = 'api'
+
+urlpatterns = [
+    path(
+        'posts/',
+        post_list,
+        name='post_list'
+    ),
+    path(
+        'posts/<int:post_id>/',
+        post_detail,
+        name='post_detail'
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        comment_list,
+        name='comment_list'
+    ),
+    path(
+        'categories/',
+        category_list,
+        name='category_list'
+    ),
+]
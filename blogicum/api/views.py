@@ -0,0 +1,120 @@
+from django.core.files.storage import default_storage
+from django.db.models import Count
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.views.decorators.http import require_safe
+
+from blog.models import Category, Comment, Post
+from .pagination import (
+    BadRequest,
+    parse_fields,
+    select,
+    serialize,
+    stream_page,
+)
+
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'image': 'image',
+    'comment_count': Count('comments'),
+}
+POST_ORDERING = ('-pub_date', '-id')
+POST_CONVERTERS = {
+    'image': lambda name: default_storage.url(name) if name else None,
+}
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'message': 'message',
+    'author': 'author__username',
+    'created_at': 'created_at',
+}
+
+
+def bad_request(error):
+    return JsonResponse(
+        {'detail': str(error)},
+        status=400,
+        json_dumps_params={'ensure_ascii': False},
+    )
+
+
+def streamed(request, *args, **kwargs):
+    try:
+        content = stream_page(request, *args, **kwargs)
+    except BadRequest as error:
+        return bad_request(error)
+    return StreamingHttpResponse(content, content_type=JSON_CONTENT_TYPE)
+
+
+@require_safe
+def post_list(request):
+    posts = Post.objects.published()
+    if 'category' in request.GET:
+        posts = posts.filter(category__slug=request.GET['category'])
+    if 'author' in request.GET:
+        posts = posts.filter(author__username=request.GET['author'])
+    return streamed(
+        request, posts, POST_FIELDS, POST_ORDERING, POST_CONVERTERS
+    )
+
+
+@require_safe
+def post_detail(request, post_id):
+    try:
+        names = parse_fields(request, POST_FIELDS)
+    except BadRequest as error:
+        return bad_request(error)
+    posts, paths = select(
+        Post.objects.visible_to(request.user).filter(id=post_id),
+        POST_FIELDS,
+        names,
+    )
+    row = posts.values_list(*paths).first()
+    if row is None:
+        raise Http404
+    return HttpResponse(
+        serialize(names, row, POST_CONVERTERS),
+        content_type=JSON_CONTENT_TYPE,
+    )
+
+
+@require_safe
+def comment_list(request, post_id):
+    if not Post.objects.visible_to(request.user).filter(id=post_id).exists():
+        raise Http404
+    return streamed(
+        request,
+        Comment.objects.filter(
+            post_id=post_id, author__deletion__isnull=True
+        ),
+        COMMENT_FIELDS,
+        ('created_at', 'id'),
+    )
+
+
+@require_safe
+def category_list(request):
+    return streamed(
+        request,
+        Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS,
+        ('id',),
+    )
@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 from blogicum.constants import MAX_LEN_TEXT
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, Location, Post, Tag
 
 
 @admin.register(Post)
@@ -60,3 +60,18 @@ class LocationAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = [field.name for field in Comment._meta.get_fields()]
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = (
+        'title',
+        'slug',
+        'post_count',
+    )
+    search_fields = (
+        'title',
+    )
+    prepopulated_fields = {
+        'slug': ('title',),
+    }
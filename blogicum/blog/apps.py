@@ -6,3 +6,6 @@ class BlogConfig(AppConfig):
     name = 'blog'
     verbose_name = 'Блог'
     verbose_name_plural = 'Блоги'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import ArchiveMonth, Post
+
+
+def month_bounds(year, month):
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
+
+
+def month_of(pub_date):
+    local = timezone.localtime(pub_date)
+    return local.year, local.month
+
+
+def store(year, month, category_id, count):
+    rows = ArchiveMonth.objects.filter(
+        year=year, month=month, category_id=category_id
+    )
+    if not count:
+        rows.delete()
+    elif not rows.update(post_count=count):
+        ArchiveMonth.objects.create(
+            year=year, month=month, category_id=category_id, post_count=count
+        )
+
+
+@transaction.atomic
+def recount(year, month, category_id):
+    # Пересчёт одной ячейки и итога месяца — два COUNT по индексу
+    # (is_published, pub_date) в пределах месяца.
+    start, end = month_bounds(year, month)
+    posts = Post.objects.published().filter(
+        pub_date__gte=start, pub_date__lt=end
+    )
+    if category_id is not None:
+        store(
+            year, month, category_id,
+            posts.filter(category_id=category_id).count(),
+        )
+    store(year, month, None, posts.count())
+
+
+def recount_posts(buckets):
+    for year, month, category_id in set(buckets):
+        recount(year, month, category_id)
+
+
+def post_bucket(pub_date, category_id):
+    return (*month_of(pub_date), category_id)
+
+
+def posts_buckets(posts):
+    return {
+        (*month_of(month), category_id)
+        for month, category_id in posts.annotate(
+            month=TruncMonth('pub_date')
+        ).values_list('month', 'category_id').order_by().distinct()
+    }
+
+
+def category_buckets(category_id):
+    return posts_buckets(Post.objects.filter(category_id=category_id))
+
+
+@transaction.atomic
+def rebuild():
+    ArchiveMonth.objects.all().delete()
+    months = Post.objects.published().annotate(
+        month=TruncMonth('pub_date')
+    ).values('month', 'category_id').annotate(
+        post_count=Count('id')
+    ).order_by()
+    rows = {}
+    for row in months:
+        year, month = month_of(row['month'])
+        for key in ((year, month, row['category_id']), (year, month, None)):
+            rows[key] = rows.get(key, 0) + row['post_count']
+    ArchiveMonth.objects.bulk_create(
+        ArchiveMonth(
+            year=year, month=month, category_id=category_id, post_count=count
+        )
+        for (year, month, category_id), count in rows.items()
+    )
+    return len(rows)
+
+
+def archive_months(category=None):
+    return ArchiveMonth.objects.filter(category=category)
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from blogicum.constants import ASYNC_VIEW_WORKERS
+from .views import CategoryListView, PostDetail, PostsListView
+
+# Отдельный ограниченный пул: по умолчанию Django выполняет синхронный код
+# под ASGI в одном потоке, и медленный запрос задерживал бы все остальные.
+executor = ThreadPoolExecutor(
+    max_workers=ASYNC_VIEW_WORKERS,
+    thread_name_prefix='blog-views',
+)
+
+
+def run_view(view, request, kwargs):
+    # Соединения с БД привязаны к потокам пула, поэтому закрываются здесь
+    # по тем же правилам CONN_MAX_AGE, что и в обычном цикле запроса.
+    close_old_connections()
+    try:
+        response = view(request, **kwargs)
+        # Шаблон отрисовывается в пуле, а не в цикле событий: при
+        # отрисовке ещё выполняются ленивые запросы к БД.
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view_class):
+    view = view_class.as_view()
+    in_pool = sync_to_async(
+        run_view, thread_sensitive=False, executor=executor
+    )
+
+    async def wrapper(request, **kwargs):
+        return await in_pool(view, request, kwargs)
+
+    wrapper.view_class = view_class
+    return wrapper
+
+
+posts_list = async_view(PostsListView)
+category_posts = async_view(CategoryListView)
+post_detail = async_view(PostDetail)
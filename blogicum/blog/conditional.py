@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from blogicum.constants import POST_LIST_STATE_TIMEOUT
+from .models import Post
+
+CONTENT_VERSION_KEY = 'content-version'
+
+
+def content_version():
+    return cache.get_or_set(CONTENT_VERSION_KEY, 1, None)
+
+
+def bump_content_version():
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.set(CONTENT_VERSION_KEY, 1, None)
+
+
+def published_state(queryset):
+    visible = Q(pub_date__lte=timezone.now())
+    return queryset.filter(
+        is_published=True,
+        category__is_published=True,
+    ).aggregate(
+        posts=Count('id', filter=visible),
+        updated=Max('updated_at', filter=visible),
+        published=Max('pub_date', filter=visible),
+        scheduled=Min('pub_date', filter=~visible),
+    )
+
+
+def cached_published_state(key, queryset, timeout):
+    # Состояние кешируется до ближайшей записи (ключ содержит версию
+    # контента) или до ближайшей отложенной публикации, поэтому ответ
+    # 304 не агрегирует публикации заново.
+    state = cache.get(key)
+    if state is None:
+        state = published_state(queryset)
+        if state['scheduled'] is not None:
+            timeout = min(
+                timeout,
+                int((state['scheduled'] - timezone.now()).total_seconds()),
+            )
+        if timeout > 0:
+            cache.set(key, state, timeout)
+    return state
+
+
+def state_last_modified(state):
+    return max(filter(None, (state['updated'], state['published'])),
+               default=None)
+
+
+def state_etag(state, *extra):
+    last_modified = state_last_modified(state)
+    return '-'.join(map(str, (
+        state['posts'],
+        last_modified and last_modified.timestamp(),
+        *extra,
+    )))
+
+
+def post_list_state(request, **kwargs):
+    if not hasattr(request, '_post_list_state'):
+        request._post_list_state = cached_published_state(
+            f'post-list-state:{content_version()}',
+            Post.objects.all(),
+            POST_LIST_STATE_TIMEOUT,
+        )
+    return request._post_list_state
+
+
+def post_list_last_modified(request, **kwargs):
+    return state_last_modified(post_list_state(request))
+
+
+def post_list_etag(request, **kwargs):
+    return state_etag(post_list_state(request), request.user.pk)
+
+
+def post_detail_state(request, post_id, **kwargs):
+    if not hasattr(request, '_post_detail_state'):
+        request._post_detail_state = Post.objects.visible_to(
+            request.user
+        ).filter(
+            pk=post_id
+        ).annotate(
+            comment_count=Count('comments')
+        ).values_list(
+            'updated_at', 'comment_count'
+        ).first()
+    return request._post_detail_state
+
+
+def post_detail_last_modified(request, post_id, **kwargs):
+    state = post_detail_state(request, post_id)
+    return state and state[0]
+
+
+def post_detail_etag(request, post_id, **kwargs):
+    state = post_detail_state(request, post_id)
+    if state is None:
+        return None
+    updated_at, comment_count = state
+    return f'{post_id}-{updated_at.timestamp()}-{comment_count}-' + str(
+        request.user.pk
+    )
@@ -0,0 +1,221 @@
+import io
+import multiprocessing
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import NamedTuple, Optional
+
+from PIL import Image
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+
+from blogicum.constants import (
+    EXIF_HEADER_BYTES,
+    EXIF_TIMEOUT,
+    EXIF_WORKERS,
+    FILE_CHUNK_SIZE,
+)
+
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+TAG_ORIENTATION = 0x0112
+TAG_DATETIME = 0x0132
+TAG_DATETIME_ORIGINAL = 0x9003
+GPS_LATITUDE_REF = 1
+GPS_LATITUDE = 2
+GPS_LONGITUDE_REF = 3
+GPS_LONGITUDE = 4
+EXIF_DATETIME_FORMAT = '%Y:%m:%d %H:%M:%S'
+
+JPEG_SOI = b'\xff\xd8'
+JPEG_APP0 = 0xE0
+JPEG_APP1 = 0xE1
+JPEG_SOS = 0xDA
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_METADATA_CHUNKS = (b'eXIf', b'tEXt', b'zTXt', b'iTXt')
+
+_executor = None
+
+
+class PhotoMetadata(NamedTuple):
+    taken_at: Optional[datetime] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    orientation: Optional[int] = None
+
+    @property
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+
+
+def _to_degrees(value, ref):
+    degrees, minutes, seconds = (float(part) for part in value)
+    result = degrees + minutes / 60 + seconds / 3600
+    return -result if ref in ('S', 'W') else result
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.strptime(value.strip('\x00 '), EXIF_DATETIME_FORMAT)
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_metadata(header):
+    # Выполняется в процессе пула: Image.open читает только заголовки,
+    # пиксельные данные не декодируются.
+    try:
+        with Image.open(io.BytesIO(header)) as image:
+            exif = image.getexif()
+    except Exception:
+        return PhotoMetadata()
+    if not exif:
+        return PhotoMetadata()
+    taken_at = (
+        _parse_datetime(exif.get_ifd(EXIF_IFD).get(TAG_DATETIME_ORIGINAL))
+        or _parse_datetime(exif.get(TAG_DATETIME))
+    )
+    latitude = longitude = None
+    gps = exif.get_ifd(GPS_IFD)
+    try:
+        latitude = _to_degrees(
+            gps[GPS_LATITUDE], gps.get(GPS_LATITUDE_REF)
+        )
+        longitude = _to_degrees(
+            gps[GPS_LONGITUDE], gps.get(GPS_LONGITUDE_REF)
+        )
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        latitude = longitude = None
+    return PhotoMetadata(
+        taken_at=taken_at,
+        latitude=latitude,
+        longitude=longitude,
+        orientation=exif.get(TAG_ORIENTATION),
+    )
+
+
+def get_executor():
+    # spawn вместо fork: процесс веб-сервера многопоточный.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=EXIF_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def reset_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = None
+
+
+def read_metadata(upload):
+    upload.seek(0)
+    header = upload.read(EXIF_HEADER_BYTES)
+    upload.seek(0)
+    # Сломанный пул (упавший рабочий процесс) не восстанавливается сам:
+    # он пересоздаётся, и разбор повторяется один раз.
+    for _ in range(2):
+        try:
+            return get_executor().submit(parse_metadata, header).result(
+                timeout=EXIF_TIMEOUT
+            )
+        except BrokenProcessPool:
+            reset_executor()
+        except (FutureTimeoutError, OSError):
+            break
+    return PhotoMetadata()
+
+
+def _copy(src, dst):
+    for chunk in iter(lambda: src.read(FILE_CHUNK_SIZE), b''):
+        dst.write(chunk)
+
+
+def _orientation_segment(orientation):
+    exif = Image.Exif()
+    exif[TAG_ORIENTATION] = orientation
+    payload = exif.tobytes()
+    return struct.pack('>BBH', 0xFF, JPEG_APP1, len(payload) + 2) + payload
+
+
+def _strip_jpeg(src, dst, orientation):
+    dst.write(src.read(2))
+    pending = b''
+    if orientation and orientation != 1:
+        pending = _orientation_segment(orientation)
+    while True:
+        marker = src.read(2)
+        # Сегмент JFIF (APP0) должен идти сразу за SOI, ориентация
+        # записывается после него.
+        if pending and marker[1:] != bytes((JPEG_APP0,)):
+            dst.write(pending)
+            pending = b''
+        if len(marker) < 2 or marker[0] != 0xFF:
+            dst.write(marker)
+            break
+        if marker[1] == JPEG_SOS:
+            dst.write(marker)
+            break
+        length = src.read(2)
+        if len(length) < 2:
+            dst.write(marker + length)
+            break
+        segment = src.read(struct.unpack('>H', length)[0] - 2)
+        if marker[1] != JPEG_APP1:
+            dst.write(marker + length + segment)
+    _copy(src, dst)
+
+
+def _strip_png(src, dst):
+    dst.write(src.read(len(PNG_SIGNATURE)))
+    while True:
+        head = src.read(8)
+        if len(head) < 8:
+            dst.write(head)
+            break
+        length, chunk_type = struct.unpack('>I4s', head)
+        if chunk_type in PNG_METADATA_CHUNKS:
+            src.seek(length + 4, io.SEEK_CUR)
+            continue
+        dst.write(head)
+        if chunk_type == b'IDAT':
+            break
+        dst.write(src.read(length + 4))
+    _copy(src, dst)
+
+
+def strip_metadata(upload, orientation=None):
+    # Из JPEG убираются все сегменты APP1 (EXIF и XMP), а ориентация
+    # записывается заново, чтобы фотография не отображалась повёрнутой.
+    upload.seek(0)
+    signature = upload.read(len(PNG_SIGNATURE))
+    upload.seek(0)
+    if signature.startswith(JPEG_SOI):
+        strip = _strip_jpeg
+        args = (orientation,)
+    elif signature == PNG_SIGNATURE:
+        strip = _strip_png
+        args = ()
+    else:
+        return upload
+    stripped = SpooledTemporaryFile(
+        max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+    )
+    strip(upload.file, stripped, *args)
+    size = stripped.tell()
+    stripped.seek(0)
+    upload.seek(0)
+    return UploadedFile(
+        file=stripped,
+        name=upload.name,
+        content_type=upload.content_type,
+        size=size,
+        charset=upload.charset,
+    )
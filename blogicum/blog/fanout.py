@@ -0,0 +1,139 @@
+from itertools import islice
+
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+from blogicum.constants import (
+    FANOUT_BACKFILL_POSTS,
+    FANOUT_BATCH_SIZE,
+    FANOUT_CELEBRITY_TTL,
+    FANOUT_FOLLOWER_LIMIT,
+)
+from .models import FeedEntry, Follow, Post
+
+CELEBRITIES_KEY = 'fanout-celebrities'
+
+
+def celebrity_ids():
+    # Авторы, чьи публикации не раскладываются по лентам, а подмешиваются
+    # при чтении. Один GROUP BY по таблице подписок раз в несколько минут.
+    ids = cache.get(CELEBRITIES_KEY)
+    if ids is None:
+        ids = frozenset(
+            Follow.objects.values('author').annotate(
+                followers=Count('id')
+            ).filter(
+                followers__gte=FANOUT_FOLLOWER_LIMIT
+            ).values_list('author', flat=True)
+        )
+        cache.set(CELEBRITIES_KEY, ids, FANOUT_CELEBRITY_TTL)
+    return ids
+
+
+def invalidate_celebrities(author_id):
+    # Сбрасывать нужно, только когда автор достиг порога.
+    if Follow.objects.filter(author_id=author_id).count() == (
+        FANOUT_FOLLOWER_LIMIT
+    ):
+        cache.delete(CELEBRITIES_KEY)
+
+
+def dropped_below_limit(author_id):
+    return Follow.objects.filter(author_id=author_id).count() == (
+        FANOUT_FOLLOWER_LIMIT - 1
+    )
+
+
+def backfill_author(author_id):
+    # Пока автор был популярным, его публикации подмешивались при чтении
+    # и в ленты не попадали. Они дописываются подписчикам до сброса
+    # кеша, чтобы не пропасть из лент в промежутке.
+    posts = list(
+        Post.objects.filter(author_id=author_id).order_by(
+            '-pub_date'
+        ).values_list('id', 'pub_date')[:FANOUT_BACKFILL_POSTS]
+    )
+    written = write_entries(
+        posts,
+        Follow.objects.filter(author_id=author_id).values_list(
+            'follower_id', flat=True
+        ).iterator(chunk_size=FANOUT_BATCH_SIZE),
+    )
+    cache.delete(CELEBRITIES_KEY)
+    return written
+
+
+def write_entries(post_ids_and_dates, owner_ids):
+    owner_ids = iter(owner_ids)
+    written = 0
+    while True:
+        owners = list(islice(owner_ids, FANOUT_BATCH_SIZE))
+        if not owners:
+            return written
+        FeedEntry.objects.bulk_create(
+            (
+                FeedEntry(owner_id=owner_id, post_id=post_id, pub_date=date)
+                for owner_id in owners
+                for post_id, date in post_ids_and_dates
+            ),
+            batch_size=FANOUT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        written += len(owners) * len(post_ids_and_dates)
+
+
+def fan_out(post_id, force=False):
+    post = Post.objects.filter(pk=post_id).values_list(
+        'author_id', 'pub_date'
+    ).first()
+    if post is None:
+        return 0
+    author_id, pub_date = post
+    if not force and author_id in celebrity_ids():
+        return 0
+    return write_entries(
+        [(post_id, pub_date)],
+        Follow.objects.filter(author_id=author_id).values_list(
+            'follower_id', flat=True
+        ).iterator(chunk_size=FANOUT_BATCH_SIZE),
+    )
+
+
+def backfill_follow(follower_id, author_id):
+    if author_id in celebrity_ids():
+        return 0
+    posts = list(
+        Post.objects.filter(author_id=author_id).order_by(
+            '-pub_date'
+        ).values_list('id', 'pub_date')[:FANOUT_BACKFILL_POSTS]
+    )
+    return write_entries(posts, [follower_id])
+
+
+def drop_follow(follower_id, author_id):
+    FeedEntry.objects.filter(
+        owner_id=follower_id, post__author_id=author_id
+    ).delete()
+
+
+def personal_feed(posts, user, celebrities=None, limit=None):
+    if celebrities is None:
+        celebrities = celebrity_ids()
+    # Обычные авторы читаются из ленты, публикации популярных авторов
+    # подмешиваются запросом по их id. С limit обе части обрезаются до
+    # конца запрошенной страницы: лента идёт по индексу
+    # (owner, pub_date) от новых записей и не сортируется целиком.
+    inbox = FeedEntry.objects.filter(
+        Exists(posts.filter(pk=OuterRef('post_id'))), owner=user
+    ).order_by('-pub_date').values('post_id')
+    if limit is not None:
+        inbox = inbox[:limit]
+    condition = Q(id__in=inbox)
+    if celebrities:
+        merged = posts.filter(author_id__in=Follow.objects.filter(
+            follower=user, author_id__in=celebrities
+        ).values('author_id')).order_by('-pub_date').values('id')
+        if limit is not None:
+            merged = merged[:limit]
+        condition |= Q(id__in=merged)
+    return posts.filter(condition)
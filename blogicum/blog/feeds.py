@@ -0,0 +1,182 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from blogicum.constants import (
+    FEED_CACHE_TIMEOUT,
+    FEED_ITEMS,
+)
+from .conditional import (
+    cached_published_state,
+    content_version,
+    state_etag,
+    state_last_modified,
+)
+from .models import Category, Post
+
+
+class LatestPostsFeed(Feed):
+    title = 'Блогикум'
+    link = reverse_lazy('blog:index')
+    description = 'Новые публикации'
+
+    def get_scope(self, **kwargs):
+        return Post.objects.all()
+
+    def items(self, obj=None):
+        return self.get_scope(
+            **self.scope_kwargs(obj)
+        ).published().defer(
+            'text',
+            'body_html',
+        ).select_related(
+            'author',
+        ).order_by(
+            '-pub_date'
+        )[:FEED_ITEMS]
+
+    def scope_kwargs(self, obj):
+        return {}
+
+    def get_feed(self, obj, request):
+        # cached_feed создаёт экземпляр ленты на каждый запрос,
+        # поэтому запрос можно сохранить для абсолютных ссылок.
+        self.request = request
+        return super().get_feed(obj, request)
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_author_link(self, item):
+        # В отличие от ссылок на записи, ссылку автора Feed не дополняет
+        # доменом.
+        return self.request.build_absolute_uri(
+            reverse('blog:profile', args=(item.author.username,))
+        )
+
+
+class CategoryFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug, is_published=True)
+
+    def get_scope(self, slug):
+        return Post.objects.filter(category__slug=slug)
+
+    def scope_kwargs(self, obj):
+        return {'slug': obj.slug}
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def description(self, obj):
+        return obj.description
+
+
+class AuthorFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(get_user_model(), username=username)
+
+    def get_scope(self, username):
+        return Post.objects.filter(author__username=username)
+
+    def scope_kwargs(self, obj):
+        return {'username': obj.username}
+
+    def title(self, obj):
+        return f'Блогикум: публикации @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+    def description(self, obj):
+        return f'Новые публикации пользователя @{obj.username}'
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorAtomFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def feed_cache_key(prefix, feed, kwargs, version):
+    scope = hashlib.md5(
+        repr(sorted(kwargs.items())).encode('utf-8')
+    ).hexdigest()
+    return f'{prefix}:{type(feed).__name__}:{scope}:{version}'
+
+
+def feed_state(feed, kwargs):
+    return cached_published_state(
+        feed_cache_key('feed-state', feed, kwargs, content_version()),
+        feed.get_scope(**kwargs),
+        FEED_CACHE_TIMEOUT,
+    )
+
+
+def cached_feed(feed_class):
+    feed = feed_class()
+
+    def view(request, **kwargs):
+        state = feed_state(feed, kwargs)
+        etag = quote_etag(state_etag(state))
+        last_modified = state_last_modified(state)
+        last_modified = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        key = feed_cache_key('feed', feed, kwargs, etag)
+        cached = cache.get(key)
+        if cached is None:
+            response = feed_class()(request, **kwargs)
+            cache.set(
+                key,
+                (response.content, response['Content-Type']),
+                FEED_CACHE_TIMEOUT,
+            )
+        else:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    return view
@@ -1,9 +1,18 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
 
-from .models import Comment, Post
+from . import exif
+from .models import Comment, Location, Post, PostTag
 
 
 class PostForm(forms.ModelForm):
+    tags = forms.CharField(
+        label='Теги',
+        required=False,
+        help_text='Через запятую.',
+    )
+
     class Meta:
         model = Post
         fields = (
@@ -20,6 +29,56 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['pub_date'].required = False
+        self.fields['pub_date'].help_text = (
+            'Если оставить пустым, будет взята дата съёмки фотографии.'
+        )
+        if self.instance.pk:
+            self.fields['tags'].initial = ', '.join(
+                self.instance.tags.values_list('title', flat=True)
+            )
+
+    def clean_tags(self):
+        return [
+            title.strip() for title in self.cleaned_data['tags'].split(',')
+            if title.strip()
+        ]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        image = cleaned_data.get('image')
+        metadata = exif.PhotoMetadata()
+        if isinstance(image, UploadedFile):
+            metadata = exif.read_metadata(image)
+            cleaned_data['image'] = exif.strip_metadata(
+                image, metadata.orientation
+            )
+        if not cleaned_data.get('pub_date'):
+            cleaned_data['pub_date'] = self.get_default_pub_date(metadata)
+        self.photo_metadata = metadata
+        return cleaned_data
+
+    def save(self, commit=True):
+        # Место по координатам ищется или создаётся только при сохранении:
+        # неверная или брошенная форма не должна оставлять записей.
+        metadata = getattr(self, 'photo_metadata', exif.PhotoMetadata())
+        if self.instance.location_id is None and metadata.has_coordinates:
+            self.instance.location = Location.objects.nearest_or_create(
+                metadata.latitude, metadata.longitude
+            )
+        return super().save(commit)
+
+    def get_default_pub_date(self, metadata):
+        if metadata.taken_at is not None:
+            return timezone.make_aware(metadata.taken_at)
+        return self.instance.pub_date or timezone.now()
+
+    def _save_m2m(self):
+        super()._save_m2m()
+        PostTag.objects.assign(self.instance, self.cleaned_data['tags'])
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,123 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog import fanout
+from blog.models import Category, FeedEntry, Follow, Post
+from blogicum.constants import FANOUT_BATCH_SIZE
+
+BENCH_PREFIX = 'bench-fanout'
+
+
+class Rollback(Exception):
+    pass
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает раскладку публикаций по лентам при записи '
+        'и подмешивание при чтении. Все данные откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--followers', type=int, default=10 ** 5)
+        parser.add_argument('--posts', type=int, default=20)
+        parser.add_argument('--reads', type=int, default=50)
+
+    def handle(self, *args, **options):
+        # Откат отменяет и данные, и фоновую раскладку из сигналов:
+        # она ставится через on_commit. Стратегии вызываются явно.
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, followers, posts, reads, **options):
+        user_model = get_user_model()
+        author = user_model.objects.create(
+            username=f'{BENCH_PREFIX}-author', password='!'
+        )
+        category = Category.objects.create(
+            title=BENCH_PREFIX, slug=BENCH_PREFIX, description=BENCH_PREFIX
+        )
+        user_model.objects.bulk_create(
+            (
+                user_model(username=f'{BENCH_PREFIX}-{number}', password='!')
+                for number in range(followers)
+            ),
+            batch_size=FANOUT_BATCH_SIZE,
+        )
+        readers = user_model.objects.filter(
+            username__startswith=f'{BENCH_PREFIX}-'
+        ).exclude(pk=author.pk)
+        Follow.objects.bulk_create(
+            (
+                Follow(follower_id=reader_id, author=author)
+                for reader_id in readers.values_list('id', flat=True)
+            ),
+            batch_size=FANOUT_BATCH_SIZE,
+        )
+        now = timezone.now()
+        post_ids = [
+            Post.objects.create(
+                title=f'{BENCH_PREFIX} {number}',
+                text=BENCH_PREFIX,
+                author=author,
+                category=category,
+                pub_date=now - timedelta(minutes=number),
+            ).pk
+            for number in range(posts)
+        ]
+        reader = readers.first()
+        self.stdout.write(
+            f'Подписчиков: {followers}, публикаций: {posts}, '
+            f'чтений: {reads}'
+        )
+
+        write_time, written = timed(
+            lambda: sum(
+                fanout.fan_out(post_id, force=True) for post_id in post_ids
+            )
+        )
+        inbox_read = self.read_time(reader, reads, celebrities=frozenset())
+        FeedEntry.objects.filter(post_id__in=post_ids).delete()
+        merge_read = self.read_time(
+            reader, reads, celebrities=frozenset((author.pk,))
+        )
+        self.stdout.write(
+            f'{"стратегия":24} {"запись, с":>12} {"строк":>10} '
+            f'{"чтение, мс":>12}'
+        )
+        self.stdout.write(
+            f'{"раскладка при записи":24} {write_time:12.2f} '
+            f'{written:10} {inbox_read * 1000:12.2f}'
+        )
+        self.stdout.write(
+            f'{"подмешивание при чтении":24} {0:12.2f} {0:10} '
+            f'{merge_read * 1000:12.2f}'
+        )
+
+    def read_time(self, reader, reads, celebrities):
+        def read():
+            return list(
+                fanout.personal_feed(
+                    Post.objects.published(), reader, celebrities, limit=10
+                ).order_by('-pub_date').values_list('id', flat=True)[:10]
+            )
+
+        elapsed, pages = timed(lambda: [read() for _ in range(reads)])
+        if not pages[-1]:
+            raise CommandError('Лента подписчика пуста.')
+        return elapsed / reads
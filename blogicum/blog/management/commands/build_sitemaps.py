@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import SitemapShard
+from blog.sitemaps import (
+    mark_all_dirty,
+    mark_scheduled_dirty,
+    write_index,
+    write_shard,
+)
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает изменившиеся части карты сайта.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересобрать все части.',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options['all'] or not SitemapShard.objects.exists():
+            mark_all_dirty()
+        mark_scheduled_dirty(now)
+        dirty = list(
+            SitemapShard.objects.filter(is_dirty=True).order_by(
+                'kind', 'number'
+            )
+        )
+        # Отметка снимается до сборки: запись, пришедшая во время
+        # генерации, снова пометит часть и попадёт в следующий запуск.
+        SitemapShard.objects.filter(
+            pk__in=[shard.pk for shard in dirty]
+        ).update(is_dirty=False, generated_at=now)
+        for shard in dirty:
+            count = write_shard(shard.kind, shard.number)
+            self.stdout.write(f'{shard.kind} #{shard.number}: {count}')
+        shards = write_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересобрано частей: {len(dirty)}, всего в индексе: {shards}'
+        ))
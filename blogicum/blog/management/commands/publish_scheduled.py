@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog import archive
+from blog.models import Post
+from blog.signals import post_published
+from blogicum.constants import PUBLISH_SCHEDULER_INTERVAL
+from core.models import Checkpoint
+
+CHECKPOINT = 'publish_scheduled'
+
+
+class Command(BaseCommand):
+    help = (
+        'Отмечает публикацию отложенных записей, у которых наступила '
+        'дата, и обновляет счётчики архива.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Пересчитать архив целиком.',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Работать постоянно, проверяя расписание каждые '
+                f'{PUBLISH_SCHEDULER_INTERVAL} с.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            now = timezone.now()
+            since = Checkpoint.objects.get_value(CHECKPOINT)
+            if options['rebuild'] or since is None:
+                rows = archive.rebuild()
+                self.stdout.write(f'Архив пересчитан: {rows}')
+                options['rebuild'] = False
+            else:
+                self.publish(since, now)
+            Checkpoint.objects.set_value(CHECKPOINT, now)
+            if not options['watch']:
+                break
+            time.sleep(PUBLISH_SCHEDULER_INTERVAL)
+
+    def publish(self, since, now):
+        posts = Post.objects.published().filter(
+            pub_date__gt=since, pub_date__lte=now
+        ).only('id', 'pub_date', 'category_id', 'author_id')
+        published = 0
+        for post in posts.iterator():
+            post_published.send(sender=Post, instance=post)
+            published += 1
+        if published:
+            self.stdout.write(f'Опубликовано: {published}')
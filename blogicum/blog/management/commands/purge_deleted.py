@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.purge import purge_deleted
+from blogicum.constants import PURGE_BATCH_SIZE, PURGE_WORKER_INTERVAL
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет скрытые публикации и пользователей вместе с комментариями '
+        'небольшими пачками, затем освободившиеся изображения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PURGE_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Работать постоянно, проверяя очередь каждые '
+                f'{PURGE_WORKER_INTERVAL} с.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            posts, users = purge_deleted(options['batch_size'])
+            if posts or users:
+                self.stdout.write(
+                    f'Удалено публикаций: {posts}, пользователей: {users}'
+                )
+            if not options['watch']:
+                break
+            time.sleep(PURGE_WORKER_INTERVAL)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет статистику авторов с публикациями и комментариями '
+        'и исправляет расхождения.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Исправлено авторов: {reconcile()}')
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.conditional import bump_content_version
+from blog.models import Post
+from blog.tasks import render_post_body
+from blogicum.constants import BACKFILL_BATCH_SIZE, RENDER_WORKER_INTERVAL
+
+
+class Command(BaseCommand):
+    help = (
+        'Отрисовывает Markdown публикаций, текст которых изменился '
+        'с прошлой отрисовки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Перерисовать все публикации.',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Работать постоянно, проверяя очередь каждые '
+                f'{RENDER_WORKER_INTERVAL} с.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            rendered = self.render(options['batch_size'], options['all'])
+            if rendered:
+                bump_content_version()
+                self.stdout.write(f'Отрисовано: {rendered}')
+            if not options['watch']:
+                break
+            options['all'] = False
+            time.sleep(RENDER_WORKER_INTERVAL)
+
+    def render(self, batch_size, render_all):
+        posts = Post.objects.order_by('id').values_list('id', 'text')
+        if not render_all:
+            posts = posts.filter(body_html='').exclude(text='')
+        last_id = 0
+        rendered = 0
+        while True:
+            batch = list(posts.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return rendered
+            for post_id, text in batch:
+                rendered += render_post_body(post_id, text)
+            last_id = batch[-1][0]
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.notifications import send_digests
+from blogicum.constants import DIGEST_INTERVAL
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает накопленные уведомления о комментариях в сводки '
+        'и ставит их в очередь писем, по одной на автора.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Работать постоянно, собирая сводки каждые '
+                f'{DIGEST_INTERVAL} с.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_digests()
+            if sent:
+                self.stdout.write(f'Сводок поставлено в очередь: {sent}')
+            if not options['watch']:
+                break
+            time.sleep(DIGEST_INTERVAL)
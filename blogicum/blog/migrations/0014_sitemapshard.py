@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('posts', 'Публикации'), ('categories', 'Категории'), ('profiles', 'Профили')], max_length=16, verbose_name='Раздел')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер')),
+                ('is_dirty', models.BooleanField(default=True, verbose_name='Требует обновления')),
+                ('generated_at', models.DateTimeField(blank=True, null=True, verbose_name='Сгенерирован')),
+            ],
+            options={
+                'verbose_name': 'часть карты сайта',
+                'verbose_name_plural': 'Карта сайта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sitemapshard',
+            constraint=models.UniqueConstraint(fields=('kind', 'number'), name='unique_sitemap_shard'),
+        ),
+    ]
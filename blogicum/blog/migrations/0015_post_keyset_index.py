@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_sitemapshard'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['pub_date', 'id'], name='blog_post_pub_dat_af0875_idx'),
+        ),
+    ]
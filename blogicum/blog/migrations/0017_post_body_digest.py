@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_excerpt_body_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_digest',
+            field=models.BinaryField(blank=True, max_length=32, null=True, verbose_name='Хеш отрисованного текста'),
+        ),
+    ]
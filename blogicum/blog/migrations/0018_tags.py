@@ -0,0 +1,66 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_body_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+            ],
+            options={
+                'verbose_name': 'тег публикации',
+                'verbose_name_plural': 'Теги публикаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=64, verbose_name='Название')),
+                ('slug', models.SlugField(allow_unicode=True, max_length=64, unique=True, verbose_name='Идентификатор')),
+                ('post_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Публикаций')),
+            ],
+            options={
+                'verbose_name': 'тег',
+                'verbose_name_plural': 'Теги',
+                'ordering': ('title',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-post_count', 'title'], name='blog_tag_post_co_802d30_idx'),
+        ),
+        migrations.AddField(
+            model_name='posttag',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tagged', to='blog.post', verbose_name='Публикация'),
+        ),
+        migrations.AddField(
+            model_name='posttag',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tagged', to='blog.tag', verbose_name='Тег'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='posts', through='blog.PostTag', to='blog.Tag', verbose_name='Теги'),
+        ),
+        migrations.AddIndex(
+            model_name='posttag',
+            index=models.Index(fields=['tag', 'pub_date'], name='blog_postta_tag_id_222d82_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='posttag',
+            constraint=models.UniqueConstraint(fields=('post', 'tag'), name='unique_post_tag'),
+        ),
+    ]
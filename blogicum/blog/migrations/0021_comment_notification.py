@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_follow_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification', to='blog.comment', verbose_name='Комментарий')),
+            ],
+            options={
+                'verbose_name': 'уведомление о комментарии',
+                'verbose_name_plural': 'Уведомления о комментариях',
+            },
+        ),
+    ]
@@ -1,9 +1,45 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.text import slugify
 
-from blogicum.constants import CHARACTERS_IN_STRING, MAX_CHARACTERS
+from blogicum.constants import (
+    CHARACTERS_IN_STRING,
+    EXCERPT_LENGTH,
+    LOCATION_MATCH_DEGREES,
+    MAX_CHARACTERS,
+    TAG_LENGTH,
+)
 from core.models import PublishedModel
+from .rendering import make_excerpt, text_digest
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(
+            pub_date__lte=timezone.now(),
+            is_published=True,
+            category__is_published=True,
+        )
+
+    def visible_to(self, user):
+        return self.filter(
+            Q(author__username=user)
+            | Q(
+                Q(is_published=True),
+                Q(category__is_published=True),
+                Q(pub_date__lte=timezone.now())
+            )
+        )
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    # Удалённые публикации скрыты сразу, а строки и связанные с ними
+    # комментарии вычищает purge_deleted небольшими пачками.
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
 
 
 class Post(PublishedModel):
@@ -48,14 +84,76 @@ class Post(PublishedModel):
         blank=True,
         upload_to='img_publications',
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True,
+    )
+    excerpt = models.CharField(
+        'Анонс',
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+    )
+    body_html = models.TextField(
+        'Текст в HTML',
+        blank=True,
+        editable=False,
+    )
+    tags = models.ManyToManyField(
+        'Tag',
+        through='PostTag',
+        blank=True,
+        verbose_name='Теги',
+        related_name='posts',
+    )
+    body_digest = models.BinaryField(
+        'Хеш отрисованного текста',
+        max_length=32,
+        null=True,
+        blank=True,
+    )
+
+    is_deleted = models.BooleanField(
+        'Удалено',
+        default=False,
+        editable=False,
+    )
+
+    objects = PostManager()
+    all_objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(fields=('is_published', 'pub_date')),
+            models.Index(fields=('pub_date', 'id')),
+            models.Index(
+                fields=('id',),
+                condition=Q(is_deleted=True),
+                name='post_deleted',
+            ),
+        )
 
     def __str__(self):
         return self.title[:MAX_CHARACTERS]
 
+    def save(self, *args, **kwargs):
+        # Markdown отрисовывается в фоне (blog.tasks), а до этого страница
+        # показывает текст как есть. Неизменённый текст не перерисовывается.
+        self._render_pending = (
+            text_digest(self.text) != bytes(self.body_digest or b'')
+        )
+        if self._render_pending:
+            self.excerpt = make_excerpt(self.text)
+            self.body_html = ''
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {
+                    *update_fields, 'excerpt', 'body_html'
+                }
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse_lazy(
             'blog:post_detail',
@@ -88,15 +186,64 @@ class Category(PublishedModel):
         return self.title[:MAX_CHARACTERS]
 
 
+class LocationQuerySet(models.QuerySet):
+    def nearest(self, latitude, longitude):
+        candidates = self.filter(
+            latitude__range=(
+                latitude - LOCATION_MATCH_DEGREES,
+                latitude + LOCATION_MATCH_DEGREES,
+            ),
+            longitude__range=(
+                longitude - LOCATION_MATCH_DEGREES,
+                longitude + LOCATION_MATCH_DEGREES,
+            ),
+        )
+        return min(
+            candidates,
+            key=lambda location: (
+                (location.latitude - latitude) ** 2
+                + (location.longitude - longitude) ** 2
+            ),
+            default=None,
+        )
+
+    def nearest_or_create(self, latitude, longitude):
+        location = self.nearest(latitude, longitude)
+        if location is None:
+            location = self.create(
+                name=f'{latitude:.4f}, {longitude:.4f}',
+                latitude=latitude,
+                longitude=longitude,
+                # Координаты из фотографии публикует администратор.
+                is_published=False,
+            )
+        return location
+
+
 class Location(PublishedModel):
     name = models.CharField(
         'Название места',
         max_length=CHARACTERS_IN_STRING,
     )
+    latitude = models.FloatField(
+        'Широта',
+        null=True,
+        blank=True,
+    )
+    longitude = models.FloatField(
+        'Долгота',
+        null=True,
+        blank=True,
+    )
+
+    objects = LocationQuerySet.as_manager()
 
     class Meta(PublishedModel.Meta):
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (
+            models.Index(fields=('latitude', 'longitude')),
+        )
 
     def __str__(self):
         return self.name[:MAX_CHARACTERS]
@@ -129,4 +276,296 @@ class Comment(PublishedModel):
         return f'Комментарий "{self.author}" на "{self.post}"'
 
     def get_absolute_url(self):
-        return reverse_lazy('blog:post_detail', args=(self.post.id, ))
+        return reverse_lazy('blog:post_detail', args=(self.post_id, ))
+
+
+class SitemapShard(models.Model):
+    POSTS = 'posts'
+    CATEGORIES = 'categories'
+    PROFILES = 'profiles'
+    KINDS = (
+        (POSTS, 'Публикации'),
+        (CATEGORIES, 'Категории'),
+        (PROFILES, 'Профили'),
+    )
+
+    kind = models.CharField(
+        'Раздел',
+        max_length=16,
+        choices=KINDS,
+    )
+    number = models.PositiveIntegerField(
+        'Номер',
+    )
+    is_dirty = models.BooleanField(
+        'Требует обновления',
+        default=True,
+    )
+    generated_at = models.DateTimeField(
+        'Сгенерирован',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'часть карты сайта'
+        verbose_name_plural = 'Карта сайта'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('kind', 'number'),
+                name='unique_sitemap_shard',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.kind} #{self.number}'
+
+
+class Tag(models.Model):
+    title = models.CharField(
+        'Название',
+        max_length=TAG_LENGTH,
+    )
+    slug = models.SlugField(
+        'Идентификатор',
+        max_length=TAG_LENGTH,
+        unique=True,
+        allow_unicode=True,
+    )
+    post_count = models.PositiveIntegerField(
+        'Публикаций',
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        verbose_name = 'тег'
+        verbose_name_plural = 'Теги'
+        ordering = ('title',)
+        indexes = (
+            models.Index(fields=('-post_count', 'title')),
+        )
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse_lazy('blog:tag_posts', args=(self.slug,))
+
+
+class PostTagQuerySet(models.QuerySet):
+    def assign(self, post, titles):
+        wanted = {}
+        for title in titles:
+            slug = slugify(title, allow_unicode=True)[:TAG_LENGTH]
+            if slug:
+                wanted.setdefault(slug, title[:TAG_LENGTH])
+        tag_ids = set()
+        for slug, title in wanted.items():
+            tag, _ = Tag.objects.get_or_create(
+                slug=slug, defaults={'title': title}
+            )
+            tag_ids.add(tag.id)
+        # Удаление и создание по одной записи вызывают сигналы, которые
+        # поддерживают Tag.post_count.
+        self.filter(post=post).exclude(tag_id__in=tag_ids).delete()
+        current = set(
+            self.filter(post=post).values_list('tag_id', flat=True)
+        )
+        for tag_id in tag_ids - current:
+            self.create(post=post, tag_id=tag_id, pub_date=post.pub_date)
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='tagged',
+    )
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        verbose_name='Тег',
+        related_name='tagged',
+    )
+    pub_date = models.DateTimeField(
+        'Дата и время публикации',
+    )
+
+    objects = PostTagQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'тег публикации'
+        verbose_name_plural = 'Теги публикаций'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'tag'),
+                name='unique_post_tag',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('tag', 'pub_date')),
+        )
+
+    def __str__(self):
+        return f'{self.tag} — {self.post}'
+
+
+class ArchiveMonth(models.Model):
+    year = models.PositiveSmallIntegerField(
+        'Год',
+    )
+    month = models.PositiveSmallIntegerField(
+        'Месяц',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name='Категория',
+        help_text='Пусто — все категории.',
+        related_name='archive_months',
+    )
+    post_count = models.PositiveIntegerField(
+        'Публикаций',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'месяц архива'
+        verbose_name_plural = 'Архив'
+        ordering = ('-year', '-month')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('year', 'month', 'category'),
+                name='unique_archive_month',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.month:02}.{self.year}: {self.post_count}'
+
+    def get_absolute_url(self):
+        return reverse_lazy(
+            'blog:archive_month', args=(self.year, self.month)
+        )
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        verbose_name='Подписчик',
+        related_name='following',
+    )
+    author = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+        related_name='followers',
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('follower', 'author'),
+                name='unique_follow',
+            ),
+            models.CheckConstraint(
+                check=~Q(follower=models.F('author')),
+                name='follow_not_self',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.follower} → {self.author}'
+
+
+class FeedEntry(models.Model):
+    owner = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        verbose_name='Читатель',
+        related_name='feed_entries',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='feed_entries',
+    )
+    pub_date = models.DateTimeField(
+        'Дата и время публикации',
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Ленты подписок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('owner', 'post'),
+                name='unique_feed_entry',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('owner', 'pub_date')),
+        )
+
+    def __str__(self):
+        return f'{self.owner}: {self.post}'
+
+
+class CommentNotification(models.Model):
+    # Событие — одна узкая строка на комментарий; получатель и текст
+    # письма вычисляются при сборке сводки.
+    comment = models.OneToOneField(
+        Comment,
+        on_delete=models.CASCADE,
+        verbose_name='Комментарий',
+        related_name='notification',
+    )
+
+    class Meta:
+        verbose_name = 'уведомление о комментарии'
+        verbose_name_plural = 'Уведомления о комментариях'
+
+    def __str__(self):
+        return str(self.comment_id)
+
+
+class AuthorStats(models.Model):
+    # Счётчики меняются сигналами публикаций и комментариев, чтобы
+    # профиль не агрегировал по Post и Comment; расхождения исправляет
+    # команда reconcile_author_stats.
+    user = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Пользователь',
+        related_name='stats',
+    )
+    post_count = models.PositiveIntegerField(
+        'Публикаций',
+        default=0,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Комментариев',
+        default=0,
+    )
+    last_post_at = models.DateTimeField(
+        'Последняя публикация',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return str(self.user)
@@ -0,0 +1,74 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from blogicum.constants import DIGEST_POSTS_LIMIT
+from .models import CommentNotification
+
+DIGEST_SUBJECT = 'Новые комментарии к вашим публикациям'
+DIGEST_TEMPLATE = 'blog/comment_digest.txt'
+
+
+def digest_rows(notifications):
+    # Один GROUP BY (автор, публикация) по всем накопленным событиям:
+    # комментарии к собственным публикациям и авторы без почты
+    # отсеиваются в том же запросе.
+    return notifications.exclude(
+        comment__author=F('comment__post__author')
+    ).exclude(
+        comment__post__author__email=''
+    ).values(
+        email=F('comment__post__author__email'),
+        username=F('comment__post__author__username'),
+        post_id=F('comment__post_id'),
+        title=F('comment__post__title'),
+    ).annotate(
+        comments=Count('id')
+    ).order_by('email', '-comments', 'post_id')
+
+
+def build_digests(notifications):
+    base_url = settings.SITE_URL.rstrip('/')
+    messages = []
+    for email, rows in groupby(
+        digest_rows(notifications), key=lambda row: row['email']
+    ):
+        posts = [
+            {
+                **row,
+                'url': base_url + reverse(
+                    'blog:post_detail', args=(row['post_id'],)
+                ),
+            }
+            for row in rows
+        ]
+        messages.append(EmailMessage(
+            subject=DIGEST_SUBJECT,
+            body=render_to_string(DIGEST_TEMPLATE, {
+                'username': posts[0]['username'],
+                'posts': posts[:DIGEST_POSTS_LIMIT],
+                'more': len(posts) - DIGEST_POSTS_LIMIT,
+                'total': sum(post['comments'] for post in posts),
+            }),
+            to=[email],
+        ))
+    return messages
+
+
+def send_digests():
+    # Граница пачки фиксируется заранее: события, записанные во время
+    # сборки, дождутся следующего запуска.
+    last_id = CommentNotification.objects.aggregate(last=Max('id'))['last']
+    if last_id is None:
+        return 0
+    pending = CommentNotification.objects.filter(id__lte=last_id)
+    with transaction.atomic():
+        messages = build_digests(pending)
+        get_connection().send_messages(messages)
+        pending.delete()
+    return len(messages)
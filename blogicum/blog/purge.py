@@ -0,0 +1,160 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from blogicum.constants import (
+    MEDIA_GC_GRACE_PERIOD,
+    PURGE_BATCH_SIZE,
+    SITEMAP_SHARD_SIZE,
+)
+from core.models import StoredFile
+from users.models import ScheduledDeletion
+from . import archive, stats
+from .conditional import bump_content_version
+from .models import (
+    Comment,
+    CommentNotification,
+    FeedEntry,
+    Follow,
+    Post,
+    PostTag,
+    SitemapShard,
+)
+from .sitemaps import mark_dirty, shard_number
+from .tags import recount_tags
+
+
+def hide_post(post):
+    # Обычное сохранение: сигналы пересчитывают архив, карту сайта
+    # и сбрасывают кеши так же, как при снятии с публикации.
+    post.is_deleted = True
+    post.save(update_fields=('is_deleted',))
+
+
+@transaction.atomic
+def hide_user(user):
+    ScheduledDeletion.objects.get_or_create(user=user)
+    user.is_active = False
+    user.save(update_fields=('is_active',))
+    posts = Post.objects.filter(author=user)
+    buckets = archive.posts_buckets(posts)
+    bounds = posts.aggregate(first=Min('id'), last=Max('id'))
+    # Все публикации скрываются одним UPDATE, поэтому то, что при
+    # сохранении делают сигналы, здесь выполняется явно.
+    posts.update(is_deleted=True)
+    archive.recount_posts(buckets)
+    recount_tags(PostTag.objects.filter(post__author=user).values('tag_id'))
+    stats.reconcile([user.pk])
+    if bounds['first'] is not None:
+        for number in range(
+            shard_number(bounds['first']), shard_number(bounds['last']) + 1
+        ):
+            mark_dirty(SitemapShard.POSTS, number * SITEMAP_SHARD_SIZE)
+    bump_content_version()
+
+
+def delete_in_chunks(queryset, batch_size=PURGE_BATCH_SIZE):
+    # Каждая пачка — отдельная короткая транзакция: блокировка записи
+    # не держится на всё время удаления.
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += queryset.filter(pk__in=ids).delete()[0]
+
+
+def delete_comments(comments, batch_size=PURGE_BATCH_SIZE, touch=False):
+    # Сигналы комментария — два UPDATE на каждую строку. Пачка удаляется
+    # без них: notification-строки и комментарии — двумя DELETE, статистика
+    # авторов пачки сверяется одним проходом, а дата публикаций
+    # обновляется одним UPDATE, только если они остаются (touch).
+    deleted = 0
+    while True:
+        batch = list(
+            comments.values_list('pk', 'post_id', 'author_id')[:batch_size]
+        )
+        if not batch:
+            return deleted
+        ids, post_ids, author_ids = map(set, zip(*batch))
+        with transaction.atomic():
+            CommentNotification.objects.filter(comment_id__in=ids).delete()
+            Comment.objects.filter(pk__in=ids)._raw_delete(
+                Comment.objects.db
+            )
+            if touch:
+                Post.objects.filter(pk__in=post_ids).update(
+                    updated_at=timezone.now()
+                )
+        stats.reconcile(author_ids - {None})
+        deleted += len(ids)
+
+
+def remove_images(names, grace=MEDIA_GC_GRACE_PERIOD):
+    names = set(filter(None, names))
+    deadline = timezone.now() - timedelta(seconds=grace)
+    removed = []
+    for name in names - StoredFile.objects.referenced(names):
+        # Тот же файл мог только что загрузиться заново, а ссылка на него
+        # появится лишь после сохранения. Свежие файлы остаются
+        # collect_media.
+        if (
+            default_storage.exists(name)
+            and default_storage.get_modified_time(name) >= deadline
+        ):
+            continue
+        default_storage.delete(name)
+        removed.append(name)
+    StoredFile.objects.filter(name__in=removed, references=0).delete()
+    return len(removed)
+
+
+def purge_post(post_id, batch_size=PURGE_BATCH_SIZE):
+    delete_comments(Comment.objects.filter(post_id=post_id), batch_size)
+    delete_in_chunks(FeedEntry.objects.filter(post_id=post_id), batch_size)
+    Post.all_objects.filter(pk=post_id).delete()
+
+
+def purge_posts(posts, batch_size=PURGE_BATCH_SIZE):
+    purged = 0
+    while True:
+        batch = list(posts.values_list('id', 'image')[:batch_size])
+        if not batch:
+            return purged
+        for post_id, _ in batch:
+            purge_post(post_id, batch_size)
+        # Изображения удаляются по пачкам: общие с ещё не вычищенными
+        # публикациями файлы останутся по счётчику ссылок.
+        remove_images(image for _, image in batch)
+        purged += len(batch)
+
+
+def purge_user(user_id, batch_size=PURGE_BATCH_SIZE):
+    purge_posts(Post.all_objects.filter(author_id=user_id), batch_size)
+    delete_comments(
+        Comment.objects.filter(author_id=user_id), batch_size, touch=True
+    )
+    for related in (
+        FeedEntry.objects.filter(owner_id=user_id),
+        Follow.objects.filter(author_id=user_id),
+        Follow.objects.filter(follower_id=user_id),
+    ):
+        delete_in_chunks(related, batch_size)
+    get_user_model().objects.filter(pk=user_id).delete()
+
+
+def purge_deleted(batch_size=PURGE_BATCH_SIZE):
+    posts = purge_posts(
+        Post.all_objects.filter(is_deleted=True).order_by('id'), batch_size
+    )
+    users = 0
+    for user_id in ScheduledDeletion.objects.values_list(
+        'user_id', flat=True
+    ):
+        purge_user(user_id, batch_size)
+        users += 1
+    return posts, users
@@ -0,0 +1,50 @@
+import hashlib
+import html
+
+import bleach
+import markdown
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from blogicum.constants import EXCERPT_LENGTH, EXCERPT_WORDS
+
+# Меняется вместе с настройками ниже, чтобы render_posts --all
+# перерисовал все публикации.
+RENDERER_VERSION = b'markdown-2'
+MARKDOWN_EXTENSIONS = ('extra', 'sane_lists', 'nl2br')
+ALLOWED_TAGS = bleach.sanitizer.ALLOWED_TAGS | {
+    'p', 'br', 'hr', 'pre', 'del', 'img',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td',
+}
+ALLOWED_ATTRIBUTES = {
+    **bleach.sanitizer.ALLOWED_ATTRIBUTES,
+    'img': ['src', 'alt', 'title'],
+}
+
+
+def text_digest(text):
+    return hashlib.sha256(RENDERER_VERSION + text.encode()).digest()
+
+
+def make_excerpt(text):
+    return Truncator(
+        Truncator(text).words(EXCERPT_WORDS)
+    ).chars(EXCERPT_LENGTH)
+
+
+def render_body(text):
+    html = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+    return bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=bleach.sanitizer.ALLOWED_PROTOCOLS,
+    )
+
+
+def render_post(text):
+    body_html = render_body(text)
+    # Анонс — обычный текст: сущности раскрываются, а экранируют его
+    # шаблоны и ленты при выводе.
+    return make_excerpt(html.unescape(strip_tags(body_html))), body_html
@@ -0,0 +1,305 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from core.models import StoredFile
+from core.tasks import run_in_background
+from . import archive, fanout, stats
+from .conditional import bump_content_version
+from .models import (
+    Category,
+    Comment,
+    CommentNotification,
+    FeedEntry,
+    Follow,
+    Location,
+    Post,
+    PostTag,
+    SitemapShard,
+    Tag,
+)
+from .sitemaps import mark_dirty, mark_posts_dirty
+from .tags import invalidate_tag_cloud, recount_tags
+from .tasks import render_in_background
+
+# Отправляется publish_scheduled, когда наступает pub_date отложенной
+# публикации: в этот момент сама запись не сохраняется.
+post_published = Signal()
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, **kwargs):
+    instance._previous = (
+        sender.objects.filter(pk=instance.pk).values(
+            'image', 'pub_date', 'category_id', 'is_deleted'
+        ).first()
+        if instance.pk else None
+    ) or {}
+
+
+@receiver(post_save, sender=Post)
+def count_image_references(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous', {}).get('image') or ''
+    current = instance.image.name or ''
+    if previous == current:
+        return
+    if current:
+        StoredFile.objects.acquire(current)
+    if previous:
+        StoredFile.objects.release(previous)
+
+
+@receiver(post_delete, sender=Post)
+def release_image(sender, instance, **kwargs):
+    if instance.image.name:
+        StoredFile.objects.release(instance.image.name)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_commented_post(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_author_comment(sender, instance, created, **kwargs):
+    if created:
+        stats.change(instance.author_id, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_author_comment(sender, instance, **kwargs):
+    stats.change(instance.author_id, comments=-1)
+
+
+@receiver(post_save, sender=Comment)
+def record_comment_notification(sender, instance, created, **kwargs):
+    if created:
+        CommentNotification.objects.create(comment=instance)
+
+
+@receiver(post_save, sender=Category)
+def touch_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(category=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Location)
+def touch_location_posts(sender, instance, **kwargs):
+    Post.objects.filter(location=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=PostTag)
+@receiver(post_delete, sender=PostTag)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_feeds(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def mark_post_sitemap(sender, instance, **kwargs):
+    mark_dirty(SitemapShard.POSTS, instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def mark_category_sitemap(sender, instance, **kwargs):
+    mark_dirty(SitemapShard.CATEGORIES, instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def mark_category_posts_sitemap(sender, instance, **kwargs):
+    # Видимость публикаций зависит от категории, а touch_category_posts
+    # обновляет их одним UPDATE, без сигналов публикаций.
+    mark_posts_dirty(Post.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def mark_profile_sitemap(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login', 'password'}:
+        return
+    mark_dirty(SitemapShard.PROFILES, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def schedule_body_render(sender, instance, **kwargs):
+    if getattr(instance, '_render_pending', False):
+        transaction.on_commit(
+            partial(run_in_background, render_in_background, instance.pk)
+        )
+
+
+@receiver(post_save, sender=Post)
+def sync_denormalized_dates(sender, instance, created, **kwargs):
+    if created:
+        return
+    for model in (PostTag, FeedEntry):
+        model.objects.filter(post=instance).exclude(
+            pub_date=instance.pub_date
+        ).update(pub_date=instance.pub_date)
+
+
+@receiver(post_save, sender=PostTag)
+def count_tag_use(sender, instance, created, **kwargs):
+    if created:
+        Tag.objects.filter(pk=instance.tag_id).update(
+            post_count=F('post_count') + 1
+        )
+        invalidate_tag_cloud()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_bulk_tag_use(sender, instance, action, reverse, pk_set, **kwargs):
+    # add() создаёт строки через bulk_create без post_save; удаление
+    # (remove, clear, каскад) обрабатывается post_delete у PostTag.
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        tags = Tag.objects.filter(pk=instance.pk)
+        increment = len(pk_set)
+    else:
+        tags = Tag.objects.filter(pk__in=pk_set)
+        increment = 1
+    tags.update(post_count=F('post_count') + increment)
+    invalidate_tag_cloud()
+
+
+@receiver(post_delete, sender=PostTag)
+def release_tag_use(sender, instance, **kwargs):
+    recount_tags([instance.tag_id])
+
+
+@receiver(post_save, sender=Post)
+def uncount_hidden_post_tags(sender, instance, **kwargs):
+    # Пустое прошлое состояние — публикация уже была скрыта.
+    if instance.is_deleted and getattr(instance, '_previous', {}):
+        recount_tags(
+            PostTag.objects.filter(post=instance).values('tag_id')
+        )
+
+
+@receiver(post_save, sender=Post)
+def count_archive_months(sender, instance, **kwargs):
+    buckets = [archive.post_bucket(instance.pub_date, instance.category_id)]
+    previous = getattr(instance, '_previous', {})
+    if previous:
+        buckets.append(archive.post_bucket(
+            previous['pub_date'], previous['category_id']
+        ))
+    archive.recount_posts(buckets)
+
+
+@receiver(post_delete, sender=Post)
+def uncount_archive_month(sender, instance, **kwargs):
+    archive.recount_posts([
+        archive.post_bucket(instance.pub_date, instance.category_id)
+    ])
+
+
+@receiver(post_save, sender=Post)
+def count_author_post(sender, instance, **kwargs):
+    stats.post_changed(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def uncount_author_post(sender, instance, **kwargs):
+    # Строку не создавать: вместе с публикацией может удаляться автор.
+    stats.recount_posts([instance.author_id])
+
+
+@receiver(post_save, sender=Category)
+def recount_category_authors(sender, instance, **kwargs):
+    stats.recount_posts(
+        Post.objects.filter(category=instance).values('author_id')
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_authors(sender, instance, **kwargs):
+    instance._author_ids = list(
+        Post.objects.filter(category=instance).values_list(
+            'author_id', flat=True
+        ).distinct()
+    )
+
+
+@receiver(post_delete, sender=Category)
+def recount_former_category_authors(sender, instance, **kwargs):
+    stats.recount_posts(getattr(instance, '_author_ids', ()))
+
+
+@receiver(post_save, sender=Category)
+def recount_category_archive(sender, instance, **kwargs):
+    archive.recount_posts(archive.category_buckets(instance.pk))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_months(sender, instance, **kwargs):
+    instance._archive_buckets = archive.category_buckets(instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+def recount_archive_totals(sender, instance, **kwargs):
+    archive.recount_posts(
+        (year, month, None)
+        for year, month, _ in getattr(instance, '_archive_buckets', ())
+    )
+
+
+@receiver(post_published)
+def count_published_post(sender, instance, **kwargs):
+    archive.recount_posts([
+        archive.post_bucket(instance.pub_date, instance.category_id)
+    ])
+    stats.post_changed(instance.author_id)
+    mark_dirty(SitemapShard.POSTS, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def schedule_fan_out(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            partial(run_in_background, fanout.fan_out, instance.pk)
+        )
+
+
+@receiver(post_save, sender=Follow)
+def fill_followed_feed(sender, instance, created, **kwargs):
+    if not created:
+        return
+    fanout.invalidate_celebrities(instance.author_id)
+    transaction.on_commit(partial(
+        run_in_background,
+        fanout.backfill_follow,
+        instance.follower_id,
+        instance.author_id,
+    ))
+
+
+@receiver(post_delete, sender=Follow)
+def clear_unfollowed_feed(sender, instance, **kwargs):
+    fanout.drop_follow(instance.follower_id, instance.author_id)
+    if fanout.dropped_below_limit(instance.author_id):
+        transaction.on_commit(partial(
+            run_in_background, fanout.backfill_author, instance.author_id
+        ))
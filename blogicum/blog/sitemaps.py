@@ -0,0 +1,200 @@
+import gzip
+import os
+import tempfile
+from datetime import datetime
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from blogicum.constants import SITEMAP_CHUNK_SIZE, SITEMAP_SHARD_SIZE
+from .models import Category, Post, SitemapShard
+
+INDEX_NAME = 'sitemap.xml'
+SHARD_NAME = 'sitemap-{kind}-{number}.xml.gz'
+URL_MARKER = '00000'
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_CLOSE = '</urlset>\n'
+URL_ENTRY = '<url><loc>{}</loc><lastmod>{}</lastmod></url>\n'
+INDEX_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_CLOSE = '</sitemapindex>\n'
+INDEX_ENTRY = '<sitemap><loc>{}</loc><lastmod>{}</lastmod></sitemap>\n'
+
+
+def shard_number(object_id):
+    return object_id // SITEMAP_SHARD_SIZE
+
+
+def shard_name(kind, number):
+    return SHARD_NAME.format(kind=kind, number=number)
+
+
+def section(kind):
+    # Выборка отдаёт кортежи (id, значение для адреса, lastmod):
+    # объекты моделей не создаются.
+    if kind == SitemapShard.POSTS:
+        queryset = Post.objects.published().values_list(
+            'id', 'id', 'updated_at'
+        )
+        return queryset, 'blog:post_detail', 'post_id'
+    if kind == SitemapShard.CATEGORIES:
+        queryset = Category.objects.filter(is_published=True).values_list(
+            'id', 'slug', 'created_at'
+        )
+        return queryset, 'blog:category_posts', 'slug'
+    queryset = get_user_model().objects.filter(is_active=True).values_list(
+        'id', 'username', 'date_joined'
+    )
+    return queryset, 'blog:profile', 'username'
+
+
+def location_template(url_name, kwarg):
+    # reverse() вызывается один раз на часть, а не на каждую строку.
+    path = reverse(url_name, kwargs={kwarg: URL_MARKER})
+    return settings.SITEMAP_BASE_URL.rstrip('/') + path.replace(
+        URL_MARKER, '{}'
+    )
+
+
+def iterate_rows(queryset, low, high):
+    # Keyset-обход по id: каждая пачка — индексный поиск, без OFFSET.
+    last_id = low - 1
+    while True:
+        chunk = list(
+            queryset.filter(id__gt=last_id, id__lt=high).order_by('id')[
+                :SITEMAP_CHUNK_SIZE
+            ]
+        )
+        if not chunk:
+            return
+        yield from chunk
+        last_id = chunk[-1][0]
+
+
+def write_atomic(name, write):
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=settings.SITEMAP_ROOT, suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            result = write(file)
+        if result:
+            os.replace(
+                temp_path, os.path.join(settings.SITEMAP_ROOT, name)
+            )
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return result
+
+
+def write_shard(kind, number):
+    queryset, url_name, kwarg = section(kind)
+    template = location_template(url_name, kwarg)
+    low = number * SITEMAP_SHARD_SIZE
+
+    def write(file):
+        count = 0
+        with gzip.GzipFile(fileobj=file, mode='wb', mtime=0) as archive:
+            archive.write(URLSET_OPEN.encode())
+            for _, value, lastmod in iterate_rows(
+                queryset, low, low + SITEMAP_SHARD_SIZE
+            ):
+                archive.write(URL_ENTRY.format(
+                    escape(template.format(quote(str(value)))),
+                    lastmod.date().isoformat(),
+                ).encode())
+                count += 1
+            archive.write(URLSET_CLOSE.encode())
+        return count
+
+    count = write_atomic(shard_name(kind, number), write)
+    if not count:
+        path = os.path.join(settings.SITEMAP_ROOT, shard_name(kind, number))
+        if os.path.exists(path):
+            os.unlink(path)
+    return count
+
+
+def write_index():
+    base_url = settings.SITEMAP_BASE_URL.rstrip('/') + reverse(
+        'sitemap_shard', kwargs={'name': URL_MARKER}
+    ).replace(URL_MARKER, '{}')
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    names = sorted(
+        name for name in os.listdir(settings.SITEMAP_ROOT)
+        if name.startswith('sitemap-') and name.endswith('.xml.gz')
+    )
+
+    def write(file):
+        file.write(INDEX_OPEN.encode())
+        for name in names:
+            modified = os.stat(os.path.join(settings.SITEMAP_ROOT, name))
+            file.write(INDEX_ENTRY.format(
+                escape(base_url.format(name)),
+                datetime.fromtimestamp(
+                    modified.st_mtime, timezone.utc
+                ).date().isoformat(),
+            ).encode())
+        file.write(INDEX_CLOSE.encode())
+        return True
+
+    write_atomic(INDEX_NAME, write)
+    return len(names)
+
+
+def mark_dirty(kind, object_id):
+    number = shard_number(object_id)
+    if not SitemapShard.objects.filter(kind=kind, number=number).update(
+        is_dirty=True
+    ):
+        SitemapShard.objects.get_or_create(kind=kind, number=number)
+
+
+def mark_posts_dirty(posts):
+    # Номера частей считаются в базе: строка на часть, а не на публикацию.
+    numbers = posts.annotate(
+        shard=F('id') / SITEMAP_SHARD_SIZE
+    ).values_list('shard', flat=True).order_by().distinct()
+    for number in numbers:
+        mark_dirty(SitemapShard.POSTS, number * SITEMAP_SHARD_SIZE)
+
+
+def mark_all_dirty():
+    for kind, _ in SitemapShard.KINDS:
+        queryset, _, _ = section(kind)
+        last_id = queryset.model.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first()
+        if last_id is None:
+            continue
+        for number in range(shard_number(last_id) + 1):
+            mark_dirty(kind, number * SITEMAP_SHARD_SIZE)
+
+
+def mark_scheduled_dirty(now):
+    # Отложенные публикации не вызывают сигналов в момент наступления
+    # pub_date, поэтому части проверяются по времени своей прошлой сборки.
+    shards = SitemapShard.objects.filter(
+        kind=SitemapShard.POSTS, is_dirty=False, generated_at__isnull=False
+    ).values_list('number', 'generated_at')
+    for number, generated_at in shards:
+        low = number * SITEMAP_SHARD_SIZE
+        if Post.objects.filter(
+            id__gte=low,
+            id__lt=low + SITEMAP_SHARD_SIZE,
+            pub_date__gt=generated_at,
+            pub_date__lte=now,
+        ).exists():
+            mark_dirty(SitemapShard.POSTS, low)
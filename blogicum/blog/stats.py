@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import AuthorStats, Comment, Post
+
+
+def author_totals(author_ids=None):
+    # Два GROUP BY по индексам author_id таблиц публикаций и комментариев.
+    # Публикации считаются только видимые: отложенные и снятые
+    # не раскрывают ни число, ни дату.
+    posts = Post.objects.published().values('author').annotate(
+        post_count=Count('id'), last_post_at=Max('pub_date')
+    ).order_by()
+    comments = Comment.objects.values('author').annotate(
+        comment_count=Count('id')
+    ).order_by()
+    if author_ids is not None:
+        posts = posts.filter(author_id__in=author_ids)
+        comments = comments.filter(author_id__in=author_ids)
+    totals = {}
+    for row in posts:
+        totals[row['author']] = AuthorStats(
+            user_id=row['author'],
+            post_count=row['post_count'],
+            last_post_at=row['last_post_at'],
+        )
+    for row in comments.exclude(author=None):
+        totals.setdefault(
+            row['author'], AuthorStats(user_id=row['author'])
+        ).comment_count = row['comment_count']
+    return totals
+
+
+def reconcile(author_ids=None):
+    """Сверяет счётчики с таблицами и возвращает число исправленных."""
+    totals = author_totals(author_ids)
+    stored = AuthorStats.objects.all()
+    if author_ids is not None:
+        stored = stored.filter(user_id__in=author_ids)
+    changed = []
+    with transaction.atomic():
+        for stats in stored.select_for_update():
+            expected = totals.pop(stats.user_id, None) or AuthorStats(
+                user_id=stats.user_id
+            )
+            if (
+                stats.post_count, stats.comment_count, stats.last_post_at
+            ) != (
+                expected.post_count,
+                expected.comment_count,
+                expected.last_post_at,
+            ):
+                changed.append(expected)
+        AuthorStats.objects.bulk_update(
+            changed, ('post_count', 'comment_count', 'last_post_at')
+        )
+        # Строки, которых ещё нет, создаются сразу с итогами.
+        AuthorStats.objects.bulk_create(
+            totals.values(), ignore_conflicts=True
+        )
+    return len(changed) + len(totals)
+
+
+def change(author_id, posts=0, comments=0, **fields):
+    if author_id is None:
+        return
+    # Условие не даёт счётчику уйти ниже нуля: при расхождении строка
+    # не меняется, её исправит сверка.
+    updated = AuthorStats.objects.filter(
+        user_id=author_id,
+        post_count__gte=-posts,
+        comment_count__gte=-comments,
+    ).update(
+        post_count=F('post_count') + posts,
+        comment_count=F('comment_count') + comments,
+        **fields,
+    )
+    # Первая активность автора: строка считается целиком, изменение,
+    # вызвавшее сигнал, в таблицах уже есть. При уменьшении строка
+    # не создаётся: её может не быть, потому что удаляется сам автор.
+    if not updated and (posts > 0 or comments > 0):
+        reconcile([author_id])
+
+
+def recount_posts(author_ids):
+    # Видимость публикации меняется не только при её сохранении, но и
+    # с наступлением даты или при снятии категории, поэтому счётчик
+    # публикаций пересчитывается по индексу author_id, а не сдвигается.
+    # Возвращает число обновлённых строк, недостающие не создаются.
+    published = Post.objects.published().filter(
+        author_id=OuterRef('user_id')
+    ).order_by().values('author')
+    return AuthorStats.objects.filter(user_id__in=author_ids).update(
+        post_count=Coalesce(
+            Subquery(published.annotate(total=Count('id')).values('total')),
+            Value(0),
+        ),
+        last_post_at=Subquery(
+            published.annotate(last=Max('pub_date')).values('last')
+        ),
+    )
+
+
+def post_changed(author_id):
+    # Первая публикация автора: строки ещё нет, она считается целиком.
+    if not recount_posts([author_id]):
+        reconcile([author_id])
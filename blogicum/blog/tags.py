@@ -0,0 +1,77 @@
+import math
+
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from blogicum.constants import (
+    TAG_CLOUD_SIZE,
+    TAG_CLOUD_TIMEOUT,
+    TAG_CLOUD_WEIGHTS,
+)
+from .conditional import content_version
+from .models import Post, PostTag, Tag
+
+TAG_CLOUD_KEY = 'tag-cloud'
+
+
+def build_tag_cloud():
+    # Теги идут по индексу счётчика, а в облако попадают только те,
+    # у которых есть видимая публикация: черновики и отложенные записи
+    # не должны раскрывать свои теги.
+    visible = PostTag.objects.filter(
+        tag=OuterRef('pk'), post__in=Post.objects.published()
+    )
+    tags = list(
+        Tag.objects.filter(post_count__gt=0).filter(
+            Exists(visible)
+        ).order_by(
+            '-post_count', 'title'
+        ).values('title', 'slug', 'post_count')[:TAG_CLOUD_SIZE]
+    )
+    if not tags:
+        return []
+    # Вес по логарифмической шкале числа публикаций переводится в класс
+    # Bootstrap fs-N, где fs-1 — самый крупный шрифт.
+    low = math.log(tags[-1]['post_count'])
+    spread = math.log(tags[0]['post_count']) - low or 1
+    for tag in tags:
+        weight = round(
+            (math.log(tag['post_count']) - low) / spread
+            * (TAG_CLOUD_WEIGHTS - 1)
+        )
+        tag['font_size'] = TAG_CLOUD_WEIGHTS - weight
+    return sorted(tags, key=lambda tag: tag['title'].lower())
+
+
+def cloud_key():
+    return f'{TAG_CLOUD_KEY}:{content_version()}'
+
+
+def tag_cloud():
+    # Облако сбрасывается сигналами при изменении счётчиков тегов
+    # и вместе с версией контента при изменении публикаций; срок нужен
+    # для отложенных записей, которые открываются без сохранения.
+    key = cloud_key()
+    cloud = cache.get(key)
+    if cloud is None:
+        cloud = build_tag_cloud()
+        cache.set(key, cloud, TAG_CLOUD_TIMEOUT)
+    return cloud
+
+
+def invalidate_tag_cloud():
+    cache.delete(cloud_key())
+
+
+def recount_tags(tag_ids):
+    # Скрытые публикации в счётчик не входят. Пересчёт, а не вычитание:
+    # строки скрытой публикации удаляются позже, при вычистке, и второй
+    # раз её не вычтут.
+    uses = PostTag.objects.filter(
+        tag=OuterRef('pk'), post__is_deleted=False
+    ).order_by().values('tag').annotate(uses=Count('id')).values('uses')
+    Tag.objects.filter(pk__in=tag_ids).update(
+        post_count=Coalesce(Subquery(uses), Value(0))
+    )
+    invalidate_tag_cloud()
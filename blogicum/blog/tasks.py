@@ -0,0 +1,28 @@
+from django.utils import timezone
+
+from .conditional import bump_content_version
+from .models import Post
+from .rendering import render_post, text_digest
+
+
+def render_post_body(post_id, text=None):
+    if text is None:
+        text = Post.objects.filter(pk=post_id).values_list(
+            'text', flat=True
+        ).first()
+        if text is None:
+            return False
+    excerpt, body_html = render_post(text)
+    # Условие по text: если публикацию успели отредактировать, результат
+    # устарел и будет заменён следующей отрисовкой.
+    return bool(Post.objects.filter(pk=post_id, text=text).update(
+        excerpt=excerpt,
+        body_html=body_html,
+        body_digest=text_digest(text),
+        updated_at=timezone.now(),
+    ))
+
+
+def render_in_background(post_id):
+    if render_post_body(post_id):
+        bump_content_version()
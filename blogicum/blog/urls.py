@@ -1,37 +1,87 @@
+from django.conf import settings
 from django.urls import path
 
+from . import async_views
+from .feeds import (
+    AuthorAtomFeed,
+    AuthorFeed,
+    CategoryAtomFeed,
+    CategoryFeed,
+    LatestPostsAtomFeed,
+    LatestPostsFeed,
+    cached_feed,
+)
 from .views import (
+    ArchiveIndexView,
+    ArchiveMonthView,
     CategoryListView,
     CommentAdd,
     CommentDelete,
     CommentEdit,
     EditProfile,
+    FollowFeedView,
+    FollowToggle,
     PostCreate,
     PostEdit,
     PostDelete,
     PostDetail,
     PostsListView,
     Profile,
+    TagListView,
 )
 
 app_name = 'blog'
 
+if settings.ASYNC_VIEWS:
+    index_view = async_views.posts_list
+    category_view = async_views.category_posts
+    detail_view = async_views.post_detail
+else:
+    index_view = PostsListView.as_view()
+    category_view = CategoryListView.as_view()
+    detail_view = PostDetail.as_view()
+
 urlpatterns = [
     path(
         '',
-        PostsListView.as_view(),
+        index_view,
         name='index'
     ),
     path(
         'category/<slug:slug>/',
-        CategoryListView.as_view(),
+        category_view,
         name='category_posts'
     ),
+    path(
+        'archive/',
+        ArchiveIndexView.as_view(),
+        name='archive'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        ArchiveMonthView.as_view(),
+        name='archive_month'
+    ),
+    path(
+        'tags/<str:slug>/',
+        TagListView.as_view(),
+        name='tag_posts'
+    ),
     path(
         'profile/<str:username>/',
         Profile.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/follow/',
+        FollowToggle.as_view(),
+        name='follow'
+    ),
+    path(
+        'feed/',
+        FollowFeedView.as_view(),
+        name='follow_feed'
+    ),
     path(
         'profile/<str:username>/edit/',
         EditProfile.as_view(),
@@ -54,7 +104,7 @@ urlpatterns = [
     ),
     path(
         'posts/<int:post_id>/',
-        PostDetail.as_view(),
+        detail_view,
         name='post_detail'
     ),
     path(
@@ -72,4 +122,34 @@ urlpatterns = [
         CommentDelete.as_view(),
         name='delete_comment'
     ),
+    path(
+        'feeds/rss/',
+        cached_feed(LatestPostsFeed),
+        name='feed_rss'
+    ),
+    path(
+        'feeds/atom/',
+        cached_feed(LatestPostsAtomFeed),
+        name='feed_atom'
+    ),
+    path(
+        'feeds/category/<slug:slug>/rss/',
+        cached_feed(CategoryFeed),
+        name='category_feed_rss'
+    ),
+    path(
+        'feeds/category/<slug:slug>/atom/',
+        cached_feed(CategoryAtomFeed),
+        name='category_feed_atom'
+    ),
+    path(
+        'feeds/author/<str:username>/rss/',
+        cached_feed(AuthorFeed),
+        name='author_feed_rss'
+    ),
+    path(
+        'feeds/author/<str:username>/atom/',
+        cached_feed(AuthorAtomFeed),
+        name='author_feed_atom'
+    ),
 ]
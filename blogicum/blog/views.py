@@ -4,33 +4,79 @@ from django.contrib.auth.mixins import (
     UserPassesTestMixin,
 )
 from django.db.models import Count, Q
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.http import condition
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
-    UpdateView
+    UpdateView,
+    View,
 )
 from django.views.generic.edit import ModelFormMixin
 
-from blogicum.constants import NUMBER_POSTS_ON_PAGE
+from blogicum.constants import ANONYMOUS_CACHE_MAX_AGE, NUMBER_POSTS_ON_PAGE
+from core.cache import cache_for_anonymous
+from core.paginator import CachedCountPaginator
+from users.forms import ProfileForm
+from .archive import archive_months, month_bounds
+from .conditional import (
+    content_version,
+    post_detail_etag,
+    post_detail_last_modified,
+    post_list_etag,
+    post_list_last_modified,
+)
 from .forms import CommentForm, PostForm
-from .models import Category, Comment, Post
+from .fanout import personal_feed
+from .models import Category, Comment, Follow, Post, Tag
+from .purge import hide_post
+from .tags import tag_cloud
+
+
+class CachedCountMixin:
+    paginator_class = CachedCountPaginator
+
+    def get_count_key(self):
+        return f'{content_version()}:{self.request.path}'
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            count_key=self.get_count_key(),
+            count_queryset=self.get_visible_posts(),
+            **kwargs,
+        )
 
 
-class BaseListMixin:
+class BaseListMixin(CachedCountMixin):
     paginate_by = NUMBER_POSTS_ON_PAGE
     model = Post
 
+    @method_decorator(cache_for_anonymous(ANONYMOUS_CACHE_MAX_AGE))
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_visible_posts(self):
+        return self.model.objects.published()
+
+    def get_page_posts(self):
+        return self.get_visible_posts()
+
     def get_queryset(self):
-        return self.model.objects.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
+        return self.get_page_posts().defer(
+            'text',
+            'body_html',
         ).annotate(
             comment_count=Count('comments')
         ).select_related(
@@ -45,6 +91,18 @@ class BaseListMixin:
 class PostsListView(BaseListMixin, ListView):
     template_name = 'blog/index.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag_cloud'] = tag_cloud()
+        return context
+
+    @method_decorator(condition(
+        etag_func=post_list_etag,
+        last_modified_func=post_list_last_modified,
+    ))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 class CategoryListView(BaseListMixin, ListView):
     template_name = 'blog/category.html'
@@ -58,24 +116,94 @@ class CategoryListView(BaseListMixin, ListView):
         )
         return context
 
-    def get_queryset(self):
-        return super().get_queryset().filter(
+    def get_visible_posts(self):
+        return super().get_visible_posts().filter(
             category__slug=self.kwargs['slug'],
         )
 
 
-class Profile(ListView):
+class TagListView(BaseListMixin, ListView):
+    template_name = 'blog/tag.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag'] = self.tag
+        return context
+
+    @cached_property
+    def tag(self):
+        return get_object_or_404(Tag, slug=self.kwargs['slug'])
+
+    def get_visible_posts(self):
+        return super().get_visible_posts().filter(tagged__tag=self.tag)
+
+    def get_queryset(self):
+        # Сортировка по PostTag.pub_date идёт по индексу (tag, pub_date).
+        return super().get_queryset().order_by('-tagged__pub_date')
+
+
+class ArchiveIndexView(ListView):
+    template_name = 'blog/archive.html'
+
+    @cached_property
+    def category(self):
+        slug = self.request.GET.get('category')
+        if not slug:
+            return None
+        return get_object_or_404(Category, slug=slug, is_published=True)
+
+    def get_queryset(self):
+        return archive_months(self.category)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = self.category
+        return context
+
+
+class ArchiveMonthView(BaseListMixin, ListView):
+    template_name = 'blog/archive_month.html'
+
+    @cached_property
+    def bounds(self):
+        try:
+            return month_bounds(self.kwargs['year'], self.kwargs['month'])
+        except ValueError:
+            raise Http404
+
+    def get_visible_posts(self):
+        start, end = self.bounds
+        return super().get_visible_posts().filter(
+            pub_date__gte=start,
+            pub_date__lt=end,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['month'] = timezone.localtime(self.bounds[0]).date()
+        context['year_months'] = archive_months().filter(
+            year=self.kwargs['year']
+        ).order_by('month')
+        return context
+
+
+class Profile(CachedCountMixin, ListView):
     paginate_by = NUMBER_POSTS_ON_PAGE
     template_name = 'blog/profile.html'
     model = Post
 
     def get_object(self):
+        # Статистика приходит тем же запросом, что и профиль.
         return get_object_or_404(
-            get_user_model(),
-            username=self.kwargs['username']
+            get_user_model().objects.select_related('stats'),
+            username=self.kwargs['username'],
+            deletion__isnull=True,
         )
 
-    def get_queryset(self):
+    def get_count_key(self):
+        return f'{super().get_count_key()}:{self.request.user.pk}'
+
+    def get_visible_posts(self):
         return self.model.objects.filter(
             Q(author__username=self.request.user)
             | Q(
@@ -84,6 +212,15 @@ class Profile(ListView):
                 Q(author__username=self.kwargs['username']),
                 Q(pub_date__lte=timezone.now())
             )
+        )
+
+    def get_page_posts(self):
+        return self.get_visible_posts()
+
+    def get_queryset(self):
+        return self.get_page_posts().defer(
+            'text',
+            'body_html',
         ).annotate(
             comment_count=Count('comments')
         ).order_by(
@@ -93,12 +230,62 @@ class Profile(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data()
         context['profile'] = self.get_object()
+        context['is_following'] = (
+            self.request.user.is_authenticated
+            and Follow.objects.filter(
+                follower=self.request.user, author=context['profile']
+            ).exists()
+        )
         return context
 
 
+class FollowFeedView(LoginRequiredMixin, BaseListMixin, ListView):
+    template_name = 'blog/follow_feed.html'
+
+    def get_count_key(self):
+        return f'{super().get_count_key()}:{self.request.user.pk}'
+
+    def get_visible_posts(self, limit=None):
+        return personal_feed(
+            super().get_visible_posts(), self.request.user, limit=limit
+        )
+
+    def get_page_posts(self):
+        # Страница n занимает первые n * paginate_by записей ленты; число
+        # страниц считается по полной ленте (get_visible_posts).
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(
+            self.page_kwarg
+        ) or 1
+        try:
+            page = int(page)
+        except ValueError:
+            page = 0
+        if page < 1:
+            return self.get_visible_posts()
+        return self.get_visible_posts(limit=page * self.paginate_by)
+
+
+class FollowToggle(LoginRequiredMixin, View):
+    http_method_names = ('post',)
+
+    def post(self, request, username):
+        author = get_object_or_404(get_user_model(), username=username)
+        if author != request.user:
+            deleted, _ = Follow.objects.filter(
+                follower=request.user, author=author
+            ).delete()
+            if not deleted:
+                Follow.objects.get_or_create(
+                    follower=request.user, author=author
+                )
+        return HttpResponseRedirect(
+            reverse_lazy('blog:profile', args=(username,))
+        )
+
+
 class EditProfile(LoginRequiredMixin, UpdateView):
     template_name = 'blog/user.html'
-    fields = ('username', 'first_name', 'last_name', 'email',)
+    form_class = ProfileForm
 
     def get_object(self):
         return get_object_or_404(
@@ -116,14 +303,18 @@ class PostDetail(ModelFormMixin, DetailView):
     model = Post
 
     def get_queryset(self):
-        return self.model.objects.filter(
-            Q(author__username=self.request.user)
-            | Q(
-                Q(is_published=True),
-                Q(category__is_published=True),
-                Q(pub_date__lte=timezone.now())
-            )
-        )
+        return self.model.objects.visible_to(self.request.user)
+
+    @method_decorator(cache_for_anonymous(ANONYMOUS_CACHE_MAX_AGE))
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    @method_decorator(condition(
+        etag_func=post_detail_etag,
+        last_modified_func=post_detail_last_modified,
+    ))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_object(self):
         return get_object_or_404(
@@ -134,7 +325,8 @@ class PostDetail(ModelFormMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comments'] = Comment.objects.filter(
-            post=self.kwargs['post_id']
+            post=self.kwargs['post_id'],
+            author__deletion__isnull=True,
         ).select_related('author')
         return context
 
@@ -142,12 +334,8 @@ class PostDetail(ModelFormMixin, DetailView):
 class CommonForPost():
     template_name = 'blog/create.html'
     form_class = PostForm
-
-    def get_object(self):
-        return get_object_or_404(
-            Post,
-            id=self.kwargs['post_id'],
-        )
+    model = Post
+    pk_url_kwarg = 'post_id'
 
 
 class PostCreate(LoginRequiredMixin, CommonForPost, CreateView):
@@ -164,9 +352,24 @@ class PostCreate(LoginRequiredMixin, CommonForPost, CreateView):
         )
 
 
-class IsUser(LoginRequiredMixin, UserPassesTestMixin):
+class OwnerRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+    # Поля, которые нужны представлению; author_id добавляется всегда.
+    object_fields = ()
+
+    def get_queryset(self):
+        return super().get_queryset().only('author', *self.object_fields)
+
+    def get_object(self, queryset=None):
+        # Права проверяются до того, как UpdateView или DeleteView
+        # загрузят объект, поэтому строка читается один раз и запоминается.
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
+
     def test_func(self):
-        return self.request.user.username == self.get_object().author.username
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return HttpResponseRedirect(reverse_lazy(
@@ -176,11 +379,26 @@ class IsUser(LoginRequiredMixin, UserPassesTestMixin):
         )
 
 
-class PostEdit(IsUser, CommonForPost, UpdateView):
-    ...
+class PostEdit(OwnerRequiredMixin, CommonForPost, UpdateView):
+    # Поля формы и то, что читают Post.save и сигналы при сохранении;
+    # отрисованный текст не загружается.
+    object_fields = (
+        *PostForm.Meta.fields,
+        'body_digest',
+        'updated_at',
+        'is_deleted',
+    )
+
 
+class PostDelete(OwnerRequiredMixin, CommonForPost, DeleteView):
+    # Всё, что читают Post.save и сигналы при скрытии публикации.
+    object_fields = ('text', 'pub_date', 'category', 'image', 'body_digest')
+
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        hide_post(self.object)
+        return HttpResponseRedirect(self.get_success_url())
 
-class PostDelete(IsUser, CommonForPost, DeleteView):
     def get_success_url(self):
         return reverse_lazy(
             'blog:profile',
@@ -193,12 +411,17 @@ class CommentAdd(LoginRequiredMixin, CreateView):
     form_class = CommentForm
 
     def form_valid(self, form):
+        if not Post.objects.filter(id=self.kwargs['post_id']).exists():
+            raise Http404
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, id=self.kwargs['post_id'])
+        form.instance.post_id = self.kwargs['post_id']
         return super().form_valid(form)
 
 
-class CommentEdit(IsUser, UpdateView):
+class CommentEdit(OwnerRequiredMixin, UpdateView):
+    model = Comment
+    pk_url_kwarg = 'comment_id'
+    object_fields = ('post', 'message')
     form_class = CommentForm
     template_name = 'blog/comment.html'
 
@@ -208,14 +431,11 @@ class CommentEdit(IsUser, UpdateView):
             args=(self.kwargs['post_id'],)
         )
 
-    def get_object(self):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs['comment_id']
-        )
-
 
-class CommentDelete(IsUser, DeleteView):
+class CommentDelete(OwnerRequiredMixin, DeleteView):
+    model = Comment
+    pk_url_kwarg = 'comment_id'
+    object_fields = ('post', 'message')
     template_name = 'blog/comment.html'
 
     def get_success_url(self):
@@ -223,9 +443,3 @@ class CommentDelete(IsUser, DeleteView):
             'blog:post_detail',
             args=(self.kwargs['post_id'],)
         )
-
-    def get_object(self):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs['comment_id']
-        )
@@ -5,3 +5,145 @@ CHARACTERS_IN_STRING = 256
 MAX_CHARACTERS = 20
 
 MAX_LEN_TEXT = 50
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXIF_WORKERS = 2
+
+EXIF_HEADER_BYTES = 128 * 1024
+
+EXIF_TIMEOUT = 5
+
+LOCATION_MATCH_DEGREES = 0.01
+
+MEDIA_GC_BATCH_SIZE = 500
+
+MEDIA_GC_GRACE_PERIOD = 60 * 60
+
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+IMMUTABLE_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+STATIC_COMPRESSION_WORKERS = 4
+
+COMPRESSION_MIN_SIZE = 200
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.ico',
+)
+
+STATIC_CACHE_MAX_AGE = 60 * 10
+
+GZIP_DYNAMIC_LEVEL = 6
+
+BROTLI_DYNAMIC_QUALITY = 5
+
+COMPRESSED_CACHE_TIMEOUT = 60 * 10
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/xml',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'image/svg+xml',
+)
+
+FEED_ITEMS = 20
+
+FEED_DESCRIPTION_WORDS = 50
+
+EXCERPT_WORDS = FEED_DESCRIPTION_WORDS
+
+EXCERPT_LENGTH = 512
+
+BACKFILL_BATCH_SIZE = 500
+
+FEED_CACHE_TIMEOUT = 60 * 60
+
+POST_LIST_STATE_TIMEOUT = 60 * 60
+
+SITEMAP_SHARD_SIZE = 50000
+
+SITEMAP_CHUNK_SIZE = 2000
+
+SITEMAP_CACHE_MAX_AGE = 3600
+
+API_PAGE_SIZE = 20
+
+API_MAX_PAGE_SIZE = 100
+
+ASYNC_VIEW_WORKERS = 8
+
+BENCH_SLOW_CLIENTS = 50
+
+BENCH_REQUESTS = 200
+
+BENCH_CONCURRENCY = 10
+
+BENCH_SLOW_DELAY = 0.2
+
+PAGINATOR_COUNT_TTL = 60
+
+PAGINATOR_COUNT_TIMEOUT = 60 * 60 * 24
+
+PAGINATOR_ON_EACH_SIDE = 2
+
+PAGINATOR_ON_ENDS = 1
+
+BACKGROUND_WORKERS = 2
+
+RENDER_WORKER_INTERVAL = 5
+
+TAG_LENGTH = 64
+
+TAG_CLOUD_SIZE = 30
+
+TAG_CLOUD_WEIGHTS = 5
+
+TAG_CLOUD_TIMEOUT = 60 * 10
+
+PUBLISH_SCHEDULER_INTERVAL = 60
+
+FANOUT_FOLLOWER_LIMIT = 10000
+
+FANOUT_BATCH_SIZE = 1000
+
+FANOUT_BACKFILL_POSTS = 50
+
+FANOUT_CELEBRITY_TTL = 5 * 60
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_DELAY = 60
+
+OUTBOX_LEASE = 5 * 60
+
+OUTBOX_WORKER_INTERVAL = 5
+
+DIGEST_INTERVAL = 60 * 60
+
+DIGEST_POSTS_LIMIT = 20
+
+PURGE_BATCH_SIZE = 500
+
+PURGE_WORKER_INTERVAL = 60
+
+SESSION_SWEEP_BATCH_SIZE = 1000
+
+ANONYMOUS_CACHE_MAX_AGE = 60
+
+THROTTLE_PERIOD = 60
+
+LOGIN_IP_LIMIT = 30
+
+LOGIN_USERNAME_LIMIT = 5
+
+REGISTRATION_IP_LIMIT = 5
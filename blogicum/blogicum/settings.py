@@ -1,5 +1,6 @@
 from django.urls import reverse_lazy
 
+import os
 from pathlib import Path
 
 
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
     'debug_toolbar',
     'django_bootstrap5',
 
+    'api.apps.ApiConfig',
     'blog.apps.BlogConfig',
     'core.apps.CoreConfig',
     'pages.apps.PagesConfig',
@@ -33,6 +35,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -43,6 +46,12 @@ MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Выставляется в asgi.py. DebugToolbarMiddleware умеет работать только
+# синхронно и перевёл бы всю цепочку обработки в один поток.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+if ASYNC_VIEWS:
+    MIDDLEWARE.remove('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -65,6 +74,47 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+    },
+    # Сжатые копии общих страниц: их легко пересчитать, поэтому кеш
+    # свой в каждом процессе, но отдельный и со своим лимитом, чтобы
+    # не вытеснять остальные данные.
+    'compressed': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'compressed',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# Общий для всех процессов memcached, например 127.0.0.1:11211.
+MEMCACHED_LOCATION = os.environ.get('BLOGICUM_MEMCACHED')
+
+if MEMCACHED_LOCATION:
+    for alias in ('sessions', 'throttle'):
+        CACHES[alias] = {
+            'BACKEND': (
+                'django.core.cache.backends.memcached.PyMemcacheCache'
+            ),
+            'LOCATION': MEMCACHED_LOCATION,
+            'KEY_PREFIX': alias,
+        }
+    # Запросы работают с сессией в общем кеше, строка в базе пишется
+    # в фоне.
+    SESSION_ENGINE = 'core.sessions'
+    SESSION_CACHE_ALIAS = 'sessions'
+else:
+    # Без общего кеша сессии хранятся в базе: кеш одного процесса
+    # не узнал бы о выходе, сделанном через другой. Счётчики попыток
+    # входа в кеше процесса годятся только для разработки.
+    CACHES['throttle'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -101,6 +151,10 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
+STATIC_ROOT = BASE_DIR / 'static'
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Без DEBUG ссылка на файл, которого нет в манифесте, — ошибка.
+STATIC_MANIFEST_STRICT = not DEBUG
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -111,7 +165,27 @@ INTERNAL_IPS = [
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+# 'X-Accel-Redirect' для nginx или 'X-Sendfile' для Apache/lighttpd.
+MEDIA_ACCEL_HEADER = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+SITE_URL = 'http://127.0.0.1:8000'
+
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+SITEMAP_BASE_URL = SITE_URL
+
+# Запросы только ставят письма в очередь; отправляет их send_outbox
+# через OUTBOX_DELIVERY_BACKEND. Для разработки подойдёт отладочный
+# SMTP-сервер: python -m smtpd -n -c DebuggingServer localhost:1025
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+OUTBOX_DELIVERY_BACKEND = os.environ.get(
+    'BLOGICUM_EMAIL_DELIVERY', 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_HOST = 'localhost'
+EMAIL_PORT = 1025
+EMAIL_TIMEOUT = 10
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 LOGIN_REDIRECT_URL = reverse_lazy('blog:index')
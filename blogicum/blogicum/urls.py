@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.urls import include, path
 from django.conf import settings
-from django.conf.urls.static import static
 
 import debug_toolbar
 
+from core.views import (
+    serve_media,
+    serve_sitemap,
+    serve_static,
+    throttle_metrics,
+)
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -13,7 +19,21 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls')),
     path('auth/', include('users.urls')),
+    path('api/v1/', include('api.urls')),
     path('', include('blog.urls')),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        serve_media,
+        name='media'
+    ),
+    path(
+        f'{settings.STATIC_URL.lstrip("/")}<path:path>',
+        serve_static,
+        name='static'
+    ),
+    path('sitemap.xml', serve_sitemap, name='sitemap'),
+    path('sitemaps/<str:name>', serve_sitemap, name='sitemap_shard'),
+    path('metrics/throttle/', throttle_metrics, name='throttle_metrics'),
 ]
 
 if settings.DEBUG:
@@ -21,8 +41,3 @@ if settings.DEBUG:
         '__debug__/',
         include(debug_toolbar.urls)
     )]
-
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
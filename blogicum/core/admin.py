@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'created_at',
+        'sent_at',
+    )
+    list_filter = (
+        'status',
+    )
+    readonly_fields = (
+        'message',
+        'last_error',
+    )
@@ -0,0 +1,39 @@
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+
+
+def set_cache_control(request, response, max_age):
+    # Ответ общий, только если в нём ничего не зависит от посетителя:
+    # нет пользователя, новых cookie и CSRF-токена. Vary: Cookie
+    # остаётся, поэтому общий кеш разделяют посетители без cookie.
+    session = getattr(request, 'session', None)
+    if (
+        request.user.is_authenticated
+        or request.META.get('CSRF_COOKIE_USED')
+        or session is not None and session.modified
+        or response.cookies
+    ):
+        patch_cache_control(response, private=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def cache_for_anonymous(max_age):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if getattr(response, 'is_rendered', True):
+                return set_cache_control(request, response, max_age)
+            # Шаблон отрисуется позже, и только тогда станет известно,
+            # понадобился ли CSRF-токен.
+            response.add_post_render_callback(
+                lambda rendered: set_cache_control(
+                    request, rendered, max_age
+                )
+            )
+            return response
+        return wrapper
+    return decorator
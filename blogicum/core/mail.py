@@ -0,0 +1,134 @@
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from blogicum.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_DELAY,
+)
+from .models import OutboxMessage
+
+# Ошибки, после которых соединение с сервером уже не годится
+# для следующих писем пачки. Отказ сервера принять конкретное письмо
+# (SMTPRecipientsRefused и т. п.) к ним не относится.
+CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def serialize(message):
+    if message.attachments:
+        raise ValueError('Вложения через очередь писем не передаются.')
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+    }
+
+
+def deserialize(data):
+    return EmailMultiAlternatives(
+        subject=data['subject'],
+        body=data['body'],
+        from_email=data['from_email'],
+        to=data['to'],
+        cc=data['cc'],
+        bcc=data['bcc'],
+        reply_to=data['reply_to'],
+        headers=data['headers'],
+        alternatives=[tuple(part) for part in data['alternatives']],
+    )
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Ставит письма в очередь; отправляет их команда send_outbox."""
+
+    def send_messages(self, email_messages):
+        messages = [
+            OutboxMessage(
+                subject=message.subject[:255], message=serialize(message)
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(messages)
+        return len(messages)
+
+
+def delivery_connection():
+    return get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+
+
+def retry_at(now, attempts):
+    return now + timedelta(seconds=OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim(now, batch_size):
+    # Письма пачки откладываются на время аренды в короткой транзакции:
+    # соседний обработчик их не возьмёт, а запросы, ставящие письма
+    # в очередь, не ждут, пока идёт разговор с почтовым сервером.
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.due(now).select_for_update(
+                skip_locked=True
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(pk__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE)
+        )
+    return OutboxMessage.objects.filter(pk__in=ids).order_by('id')
+
+
+def fail(outbox_message, error, now):
+    outbox_message.attempts += 1
+    outbox_message.last_error = repr(error)
+    if outbox_message.attempts >= OUTBOX_MAX_ATTEMPTS:
+        outbox_message.status = OutboxMessage.FAILED
+    else:
+        outbox_message.next_attempt_at = retry_at(
+            now, outbox_message.attempts
+        )
+    outbox_message.save(update_fields=(
+        'attempts', 'last_error', 'status', 'next_attempt_at'
+    ))
+
+
+def send_batch(connection, now, batch_size=OUTBOX_BATCH_SIZE):
+    """Отправляет пачку писем через открытое соединение connection."""
+    batch = list(claim(now, batch_size))
+    sent = []
+    for position, outbox_message in enumerate(batch):
+        try:
+            connection.send_messages([deserialize(outbox_message.message)])
+        except CONNECTION_ERRORS as error:
+            fail(outbox_message, error, now)
+            # Остаток пачки возвращается в очередь без попытки:
+            # отправлять его в разорванное соединение бессмысленно.
+            OutboxMessage.objects.filter(
+                pk__in=[rest.pk for rest in batch[position + 1:]]
+            ).update(next_attempt_at=now)
+            connection.close()
+            break
+        except Exception as error:
+            fail(outbox_message, error, now)
+        else:
+            sent.append(outbox_message.pk)
+    OutboxMessage.objects.filter(pk__in=sent).update(
+        status=OutboxMessage.SENT, sent_at=timezone.now()
+    )
+    return len(batch), len(sent)
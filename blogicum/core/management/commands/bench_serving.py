@@ -0,0 +1,131 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+from blogicum.constants import (
+    BENCH_CONCURRENCY,
+    BENCH_REQUESTS,
+    BENCH_SLOW_CLIENTS,
+    BENCH_SLOW_DELAY,
+)
+
+SLOW_PIECE = 16
+SLOW_READ = 1024
+
+
+async def fetch(url, delay=0):
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path = f'{path}?{parts.query}'
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or 80
+    )
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode()
+    try:
+        # Медленный клиент передаёт запрос и читает ответ маленькими
+        # порциями и держит соединение (и поток WSGI-сервера) занятым.
+        if delay:
+            for start in range(0, len(request), SLOW_PIECE):
+                writer.write(request[start:start + SLOW_PIECE])
+                await writer.drain()
+                await asyncio.sleep(delay)
+        else:
+            writer.write(request)
+            await writer.drain()
+        status = (await reader.readline()).split(b' ', 2)[1]
+        while await reader.read(SLOW_READ if delay else -1):
+            if delay:
+                await asyncio.sleep(delay)
+        return int(status)
+    finally:
+        writer.close()
+
+
+async def slow_client(url, delay):
+    while True:
+        try:
+            await fetch(url, delay)
+        except (OSError, IndexError, ValueError):
+            await asyncio.sleep(delay)
+
+
+async def measure(url, slow_clients, requests, concurrency, delay):
+    slow = [
+        asyncio.create_task(slow_client(url, delay))
+        for _ in range(slow_clients)
+    ]
+    await asyncio.sleep(delay)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def timed():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                status = await fetch(url)
+            except (OSError, IndexError, ValueError):
+                status = None
+            if status != 200:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    for task in slow:
+        task.cancel()
+    await asyncio.gather(*slow, return_exceptions=True)
+    return latencies, errors, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку быстрых запросов к уже запущенным серверам, '
+        'пока медленные клиенты держат соединения открытыми. Например: '
+        '`manage.py runserver 8000` (WSGI, поток на запрос) и '
+        '`uvicorn blogicum.asgi:application --port 8001` (ASGI).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument(
+            '--slow-clients', type=int, default=BENCH_SLOW_CLIENTS
+        )
+        parser.add_argument('--requests', type=int, default=BENCH_REQUESTS)
+        parser.add_argument(
+            '--concurrency', type=int, default=BENCH_CONCURRENCY
+        )
+        parser.add_argument('--delay', type=float, default=BENCH_SLOW_DELAY)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"URL":40} {"rps":>8} {"p50, мс":>9} {"p95, мс":>9} '
+            f'{"ошибки":>7}'
+        )
+        for url in options['urls']:
+            latencies, errors, elapsed = asyncio.run(measure(
+                url,
+                options['slow_clients'],
+                options['requests'],
+                options['concurrency'],
+                options['delay'],
+            ))
+            if len(latencies) > 1:
+                p50 = statistics.median(latencies) * 1000
+                p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+            else:
+                p50 = p95 = float('nan')
+            self.stdout.write(
+                f'{url:40} {len(latencies) / elapsed:8.1f} {p50:9.1f} '
+                f'{p95:9.1f} {errors:7}'
+            )
@@ -0,0 +1,114 @@
+import os
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blogicum.constants import MEDIA_GC_BATCH_SIZE, MEDIA_GC_GRACE_PERIOD
+from core.models import StoredFile
+from core.storage import INCOMING_DIR
+
+CURSOR_FILE = '.gc_cursor'
+
+
+def walk(root, after=(), parts=()):
+    # Каталоги читаются по одному, порядок обхода стабилен, поэтому
+    # следующий запуск продолжает с сохранённого курсора.
+    with os.scandir(os.path.join(root, *parts)) as entries:
+        entries = sorted(
+            (entry for entry in entries if not entry.name.startswith('.')),
+            key=lambda entry: entry.name,
+        )
+    for entry in entries:
+        path = parts + (entry.name,)
+        if path < after[:len(path)]:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk(root, after, path)
+        elif path > after:
+            yield path, entry.stat().st_mtime
+
+
+class Command(BaseCommand):
+    help = 'Удаляет из MEDIA_ROOT файлы, на которые нет ссылок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=MEDIA_GC_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Сколько файлов проверить за один запуск.',
+        )
+        parser.add_argument(
+            '--grace', type=int, default=MEDIA_GC_GRACE_PERIOD,
+            help='Не трогать файлы моложе указанного числа секунд.',
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        root = str(settings.MEDIA_ROOT)
+        if not os.path.isdir(root):
+            return
+        self.dry_run = options['dry_run']
+        cursor_path = os.path.join(root, CURSOR_FILE)
+        deadline = time.time() - options['grace']
+        files = walk(root, after=self.read_cursor(cursor_path))
+        if options['limit'] is not None:
+            files = islice(files, options['limit'])
+        checked = removed = 0
+        last = None
+        while True:
+            chunk = list(islice(files, options['batch_size']))
+            if not chunk:
+                break
+            checked += len(chunk)
+            last = '/'.join(chunk[-1][0])
+            removed += self.collect(root, chunk, deadline)
+        if not self.dry_run:
+            self.remove_stale_incoming(root, deadline)
+            finished = options['limit'] is None or checked < options['limit']
+            self.write_cursor(cursor_path, None if finished else last)
+        self.stdout.write(f'Проверено файлов: {checked}, удалено: {removed}')
+
+    def collect(self, root, chunk, deadline):
+        batch = {'/'.join(path): mtime for path, mtime in chunk}
+        names = set(batch)
+        orphans = [
+            name for name in names - StoredFile.objects.referenced(names)
+            if batch[name] < deadline
+        ]
+        if not self.dry_run:
+            for name in orphans:
+                path = os.path.join(root, name)
+                # Файл мог быть загружен повторно после обхода каталога.
+                if os.stat(path).st_mtime < deadline:
+                    os.remove(path)
+            StoredFile.objects.filter(
+                name__in=orphans, references=0
+            ).delete()
+        return len(orphans)
+
+    def read_cursor(self, cursor_path):
+        if not os.path.exists(cursor_path):
+            return ()
+        with open(cursor_path, encoding='utf-8') as cursor_file:
+            return tuple(cursor_file.read().split('/'))
+
+    def write_cursor(self, cursor_path, last):
+        if last is None:
+            if os.path.exists(cursor_path):
+                os.remove(cursor_path)
+            return
+        with open(cursor_path, 'w', encoding='utf-8') as cursor_file:
+            cursor_file.write(last)
+
+    def remove_stale_incoming(self, root, deadline):
+        incoming = os.path.join(root, INCOMING_DIR)
+        if not os.path.isdir(incoming):
+            return
+        with os.scandir(incoming) as entries:
+            for entry in entries:
+                if entry.stat().st_mtime < deadline:
+                    os.remove(entry.path)
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blogicum.constants import OUTBOX_BATCH_SIZE, OUTBOX_WORKER_INTERVAL
+from core.mail import CONNECTION_ERRORS, delivery_connection, send_batch
+from core.models import OutboxMessage
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди пачками через одно соединение '
+        'с почтовым сервером и повторяет неудачные попытки с задержкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Работать постоянно, проверяя очередь каждые '
+                f'{OUTBOX_WORKER_INTERVAL} с.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        connection = delivery_connection()
+        while True:
+            sent = self.send(connection, options['batch_size'])
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not options['watch']:
+                break
+            time.sleep(OUTBOX_WORKER_INTERVAL)
+
+    def send(self, connection, batch_size):
+        now = timezone.now()
+        # Соединение открывается, только когда есть что отправлять:
+        # между проверками сервер всё равно закрыл бы простаивающее.
+        if not OutboxMessage.objects.due(now).exists():
+            return 0
+        sent = 0
+        try:
+            while True:
+                connection.open()
+                claimed, batch_sent = send_batch(connection, now, batch_size)
+                sent += batch_sent
+                if claimed < batch_size:
+                    return sent
+        except CONNECTION_ERRORS as error:
+            self.stderr.write(f'Почтовый сервер недоступен: {error!r}')
+            return sent
+        finally:
+            connection.close()
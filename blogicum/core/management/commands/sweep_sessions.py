@@ -0,0 +1,31 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blogicum.constants import SESSION_SWEEP_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истёкшие сессии пачками, не блокируя таблицу '
+        'одним большим DELETE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SESSION_SWEEP_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[
+                :options['batch_size']
+            ])
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        self.stdout.write(f'Удалено сессий: {deleted}')
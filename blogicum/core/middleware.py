@@ -0,0 +1,124 @@
+import hashlib
+import zlib
+
+from django.core.cache import caches
+from django.utils.cache import cc_delim_re, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from blogicum.constants import (
+    BROTLI_DYNAMIC_QUALITY,
+    COMPRESSED_CACHE_TIMEOUT,
+    COMPRESSIBLE_CONTENT_TYPES,
+    COMPRESSION_MIN_SIZE,
+    GZIP_DYNAMIC_LEVEL,
+)
+from .views import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def gzip_compressor():
+    compressor = zlib.compressobj(GZIP_DYNAMIC_LEVEL, zlib.DEFLATED, 31)
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def brotli_compressor():
+    compressor = brotli.Compressor(quality=BROTLI_DYNAMIC_QUALITY)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+COMPRESSORS = {'gzip': gzip_compressor}
+if brotli is not None:
+    COMPRESSORS = {'br': brotli_compressor, **COMPRESSORS}
+
+
+def compress_bytes(coding, content):
+    compress, _, finish = COMPRESSORS[coding]()
+    return compress(content) + finish()
+
+
+def compress_stream(coding, chunks):
+    # Каждый чанк сразу отдаётся клиенту: flush не ждёт конца ответа.
+    compress, flush, finish = COMPRESSORS[coding]()
+    for chunk in chunks:
+        data = compress(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+def is_public(response):
+    return 'public' in (
+        directive.strip().lower()
+        for directive in cc_delim_re.split(response.get('Cache-Control', ''))
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    cache_alias = 'compressed'
+
+    def process_response(self, request, response):
+        if response.status_code != 200 or response.has_header(
+            'Content-Encoding'
+        ):
+            return response
+        # Страница с CSRF-токеном не сжимается: по размеру сжатого ответа
+        # на подобранные запросы токен можно восстановить (BREACH).
+        if request.META.get('CSRF_COOKIE_USED'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return response
+        if not response.streaming and (
+            len(response.content) < COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request)
+        coding = next(
+            (coding for coding in COMPRESSORS if coding in accepted), None
+        )
+        if coding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                coding, response.streaming_content
+            )
+            del response.headers['Content-Length']
+        else:
+            if is_public(response):
+                compressed = self.compress_cached(coding, response.content)
+            else:
+                compressed = compress_bytes(coding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
+
+    def compress_cached(self, coding, content):
+        # Одинаковые общие страницы сжимаются один раз: ключ — хеш
+        # содержимого, а хешировать в разы дешевле, чем сжимать.
+        cache = caches[self.cache_alias]
+        key = 'compressed:{}:{}'.format(
+            coding, hashlib.blake2b(content, digest_size=16).hexdigest()
+        )
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress_bytes(coding, content)
+            cache.set(key, compressed, COMPRESSED_CACHE_TIMEOUT)
+        return compressed
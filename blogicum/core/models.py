@@ -1,4 +1,7 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 
 class PublishedModel(models.Model):
@@ -12,3 +15,155 @@ class PublishedModel(models.Model):
     class Meta:
         abstract = True
         ordering = 'created_at',
+
+
+def file_field_columns():
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field.name
+
+
+class StoredFileQuerySet(models.QuerySet):
+    def acquire(self, name):
+        if not self.filter(name=name).update(references=F('references') + 1):
+            _, created = self.get_or_create(
+                name=name, defaults={'references': 1}
+            )
+            if not created:
+                self.filter(name=name).update(references=F('references') + 1)
+
+    def release(self, name):
+        self.filter(name=name, references__gt=0).update(
+            references=F('references') - 1
+        )
+
+    def referenced(self, names):
+        found = set(
+            self.filter(
+                name__in=names, references__gt=0
+            ).values_list('name', flat=True)
+        )
+        for model, field_name in file_field_columns():
+            found.update(
+                model._base_manager.filter(
+                    **{f'{field_name}__in': names - found}
+                ).values_list(field_name, flat=True)
+            )
+        return found
+
+
+class StoredFile(models.Model):
+    name = models.CharField(
+        'Путь к файлу',
+        max_length=255,
+        unique=True,
+    )
+    references = models.PositiveIntegerField(
+        'Количество ссылок',
+        default=0,
+    )
+
+    objects = StoredFileQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'файл'
+        verbose_name_plural = 'Файлы'
+
+    def __str__(self):
+        return self.name
+
+
+class CheckpointQuerySet(models.QuerySet):
+    def get_value(self, name):
+        return self.filter(name=name).values_list(
+            'value', flat=True
+        ).first()
+
+    def set_value(self, name, value):
+        self.update_or_create(name=name, defaults={'value': value})
+
+
+class Checkpoint(models.Model):
+    name = models.CharField(
+        'Задача',
+        max_length=64,
+        unique=True,
+    )
+    value = models.DateTimeField(
+        'Обработано до',
+    )
+
+    objects = CheckpointQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'отметка задачи'
+        verbose_name_plural = 'Отметки задач'
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    def due(self, now):
+        return self.filter(
+            status=OutboxMessage.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+
+
+class OutboxMessage(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.CharField(
+        'Тема',
+        max_length=255,
+    )
+    message = models.JSONField(
+        'Письмо',
+    )
+    status = models.CharField(
+        'Состояние',
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    sent_at = models.DateTimeField(
+        'Отправлено',
+        null=True,
+        blank=True,
+    )
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outbox_due',
+            ),
+        )
+
+    def __str__(self):
+        return self.subject
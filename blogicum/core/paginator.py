@@ -0,0 +1,97 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.utils.functional import cached_property
+
+from blogicum.constants import (
+    PAGINATOR_COUNT_TIMEOUT,
+    PAGINATOR_COUNT_TTL,
+    PAGINATOR_ON_EACH_SIDE,
+    PAGINATOR_ON_ENDS,
+)
+from .tasks import run_in_background
+
+
+def count_cache_key(key):
+    return 'paginator-count:' + hashlib.md5(key.encode()).hexdigest()
+
+
+def refresh_count(key, queryset):
+    count = queryset.count()
+    cache.set(
+        count_cache_key(key),
+        (count, time.time() + PAGINATOR_COUNT_TTL),
+        PAGINATOR_COUNT_TIMEOUT,
+    )
+    cache.delete(count_cache_key(key) + ':lock')
+    return count
+
+
+class WindowedPage(Page):
+    @property
+    def page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGINATOR_ON_EACH_SIDE,
+            on_ends=PAGINATOR_ON_ENDS,
+        )
+
+
+class CachedCountPaginator(Paginator):
+    # Количество страниц берётся из кеша. Устаревшее значение отдаётся
+    # сразу, а пересчёт уходит в фоновый поток; запрос COUNT(*) строится
+    # по выборке без аннотаций и JOIN для отображения.
+    def __init__(self, object_list, per_page, *args, count_key,
+                 count_queryset=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.count_key = count_key
+        self.count_queryset = (
+            object_list if count_queryset is None else count_queryset
+        )
+        self.count_is_cached = False
+
+    @cached_property
+    def count(self):
+        cached = cache.get(count_cache_key(self.count_key))
+        if cached is None:
+            return refresh_count(self.count_key, self.count_queryset)
+        count, fresh_until = cached
+        if fresh_until < time.time() and cache.add(
+            count_cache_key(self.count_key) + ':lock', True,
+            PAGINATOR_COUNT_TTL,
+        ):
+            run_in_background(
+                refresh_count, self.count_key, self.count_queryset
+            )
+        self.count_is_cached = True
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.count_is_cached:
+                raise
+        # Сохранённое значение могло отстать от новых публикаций.
+        self.__dict__['count'] = refresh_count(
+            self.count_key, self.count_queryset
+        )
+        self.__dict__.pop('num_pages', None)
+        self.count_is_cached = False
+        return super().validate_number(number)
+
+    def page(self, number):
+        # Без orphans срез не зависит от count: если сохранённое значение
+        # отстало, страница всё равно получит полный набор записей.
+        if self.orphans:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self
+        )
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.contrib.sessions.backends.base import CreateError
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore,
+)
+from django.contrib.sessions.models import Session
+from django.db import transaction
+
+from .tasks import run_closing_connections
+
+# Один поток: записи одной сессии попадают в базу в том порядке,
+# в котором были сделаны.
+writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sessions')
+pending = {}
+pending_lock = threading.Lock()
+DELETED = object()
+
+
+def write(session_key):
+    # Пока запись ждала очереди, сессия могла измениться ещё несколько
+    # раз: в базу уходит только последнее состояние.
+    with pending_lock:
+        session = pending.pop(session_key, None)
+    if session is DELETED:
+        Session.objects.filter(session_key=session_key).delete()
+    elif session is not None:
+        session.save()
+
+
+def enqueue(session_key, session):
+    with pending_lock:
+        scheduled = session_key in pending
+        pending[session_key] = session
+    if not scheduled:
+        writer.submit(run_closing_connections, write, session_key)
+
+
+def schedule(session_key, session):
+    transaction.on_commit(partial(enqueue, session_key, session))
+
+
+class SessionStore(CachedDBStore):
+    """Сессии в кеше с отложенной записью в базу.
+
+    Запрос читает и пишет только кеш; строка django_session
+    обновляется в фоне и нужна, когда запись из кеша вытеснена.
+    Кеш SESSION_CACHE_ALIAS должен быть общим для всех процессов:
+    иначе выход в одном из них не виден остальным.
+    """
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        if must_create:
+            if not self._cache.add(
+                self.cache_key, data, self.get_expiry_age()
+            ):
+                raise CreateError
+        else:
+            self._cache.set(self.cache_key, data, self.get_expiry_age())
+        schedule(self.session_key, self.create_model_instance(data))
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        # Выход удаляет строку сразу, а метка в очереди не даёт
+        # ожидающей записи восстановить сессию.
+        super().delete(session_key)
+        schedule(session_key, DELETED)
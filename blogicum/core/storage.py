@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+from blogicum.constants import (
+    COMPRESSIBLE_EXTENSIONS,
+    COMPRESSION_MIN_SIZE,
+    STATIC_COMPRESSION_WORKERS,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+INCOMING_DIR = '.incoming'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        incoming = os.path.join(self.location, INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+            digest = hasher.hexdigest()
+            name = os.path.join(directory, digest[:2], digest + extension)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(tmp_path)
+                # Ссылка на файл появится только в post_save: свежее время
+                # изменения не даёт сборщику удалить его раньше.
+                os.utime(full_path)
+            else:
+                os.makedirs(
+                    os.path.dirname(full_path),
+                    mode=self.directory_permissions_mode or 0o777,
+                    exist_ok=True,
+                )
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name.replace('\\', '/')
+
+
+def is_content_addressed(name):
+    directory, filename = os.path.split(name)
+    digest = os.path.splitext(filename)[0]
+    return (
+        len(digest) == hashlib.sha256().digest_size * 2
+        and digest.startswith(os.path.basename(directory))
+        and all(char in '0123456789abcdef' for char in digest)
+    )
+
+
+def compress_file(path):
+    with open(path, 'rb') as source:
+        data = source.read()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            written.append(suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    @property
+    def manifest_strict(self):
+        return settings.STATIC_MANIFEST_STRICT
+
+    def stored_name(self, name):
+        # При разработке collectstatic не запускается и манифеста нет:
+        # отдаём исходное имя вместо ошибки при рендеринге шаблона.
+        # В рабочем режиме пропавший файл должен быть заметен сразу.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            if self.manifest_strict:
+                raise
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = [
+            name for name in sorted({*paths, *self.hashed_files.values()})
+            if os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS
+            and self.exists(name)
+            and self.size(name) >= COMPRESSION_MIN_SIZE
+        ]
+        with ThreadPoolExecutor(STATIC_COMPRESSION_WORKERS) as executor:
+            for name, suffixes in zip(
+                names, executor.map(compress_file, map(self.path, names))
+            ):
+                for suffix in suffixes:
+                    yield name + suffix, name + suffix, True
@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from blogicum.constants import BACKGROUND_WORKERS
+
+executor = ThreadPoolExecutor(
+    max_workers=BACKGROUND_WORKERS,
+    thread_name_prefix='background',
+)
+
+
+def run_closing_connections(func, *args):
+    # Соединение с БД принадлежит потоку пула и закрывается по правилам
+    # CONN_MAX_AGE, как после обычного запроса.
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args):
+    return executor.submit(run_closing_connections, func, *args)
@@ -0,0 +1,146 @@
+import hashlib
+import math
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.core.cache import caches
+from django.shortcuts import render
+
+from blogicum.constants import THROTTLE_PERIOD
+
+# Счётчики живут в отдельном кеше: страницы и прочие данные
+# не могут их вытеснить и тем самым обнулить ограничение.
+CACHE_ALIAS = 'throttle'
+METRICS_KEY = 'throttle-metrics:{scope}:{outcome}'
+ALLOWED = 'allowed'
+REJECTED = 'rejected'
+# Лимиты всех ограниченных представлений, заполняется throttle().
+LIMITS = {}
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def request_username(request):
+    return request.POST.get('username', '').strip().lower()
+
+
+def count(key, timeout):
+    cache = caches[CACHE_ALIAS]
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Ключ успел истечь между add и incr.
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def window_key(scope, kind, value, period):
+    digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+    window, elapsed = divmod(time.time(), period)
+    return f'throttle:{scope}:{kind}:{digest}:{{}}', int(window), elapsed
+
+
+def hit(scope, kind, value, limit, period=THROTTLE_PERIOD, increment=True):
+    """Скользящее окно из двух счётчиков: текущего и прошлого периода.
+
+    Возвращает, через сколько секунд можно повторить, или 0, если
+    попытка укладывается в лимит. С increment=False попытка
+    не засчитывается, а только проверяется.
+    """
+    key, window, elapsed = window_key(scope, kind, value, period)
+    cache = caches[CACHE_ALIAS]
+    if increment:
+        current = count(key.format(window), period * 2)
+    else:
+        current = cache.get(key.format(window), 0) + 1
+    previous = cache.get(key.format(window - 1), 0)
+    weight = 1 - elapsed / period
+    if previous * weight + current <= limit:
+        return 0
+    if not previous:
+        return math.ceil(period - elapsed)
+    # Вклад прошлого окна убывает линейно: ждём, пока сумма
+    # не опустится до лимита.
+    return max(1, math.ceil(
+        (previous * weight + current - limit) / previous * period
+    ))
+
+
+def fail(scope, kind, value, period=THROTTLE_PERIOD):
+    key, window, _ = window_key(scope, kind, value, period)
+    count(key.format(window), period * 2)
+
+
+def record(scope, outcome):
+    count(METRICS_KEY.format(scope=scope, outcome=outcome), None)
+
+
+def metrics():
+    keys = {
+        METRICS_KEY.format(scope=scope, outcome=outcome): (scope, outcome)
+        for scope in LIMITS
+        for outcome in (ALLOWED, REJECTED)
+    }
+    values = caches[CACHE_ALIAS].get_many(keys)
+    result = {scope: dict(limits) for scope, limits in LIMITS.items()}
+    for key, (scope, outcome) in keys.items():
+        result[scope][outcome] = values.get(key, 0)
+    return result
+
+
+def throttle(scope, ip_limit=None, username_limit=None):
+    """Ограничивает POST-запросы до вызова представления.
+
+    Лишняя попытка отклоняется с кодом 429, не доходя до проверки
+    пароля и его хеширования.
+    """
+    LIMITS[scope] = {
+        'period': THROTTLE_PERIOD,
+        'ip_limit': ip_limit,
+        'username_limit': username_limit,
+    }
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+            username = request_username(request)
+            # С адреса считается каждая попытка, а для имени — только
+            # неудачные: иначе любой мог бы заблокировать чужое имя.
+            checks = (
+                ('ip', client_ip(request), ip_limit, True),
+                ('username', username, username_limit, False),
+            )
+            for kind, value, limit, increment in checks:
+                if limit is None or not value:
+                    continue
+                retry_after = hit(
+                    scope, kind, value, limit, increment=increment
+                )
+                if retry_after:
+                    record(scope, REJECTED)
+                    response = render(
+                        request,
+                        'pages/429.html',
+                        {'retry_after': retry_after},
+                        status=429,
+                    )
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            record(scope, ALLOWED)
+            response = view(request, *args, **kwargs)
+            # Успешный вход перенаправляет; форма, показанная снова, —
+            # неудачная попытка.
+            if (
+                username_limit is not None and username
+                and response.status_code != HTTPStatus.FOUND
+            ):
+                fail(scope, 'username', username)
+            return response
+        return wrapper
+    return decorator
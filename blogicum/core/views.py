@@ -0,0 +1,261 @@
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+)
+from django.contrib.admin.views.decorators import staff_member_required
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from blogicum.constants import (
+    COMPRESSIBLE_EXTENSIONS,
+    IMMUTABLE_CACHE_MAX_AGE,
+    MEDIA_CACHE_MAX_AGE,
+    SITEMAP_CACHE_MAX_AGE,
+    STATIC_CACHE_MAX_AGE,
+)
+from .storage import is_content_addressed
+from .throttle import metrics
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+HASHED_STATIC_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+STATIC_ENCODINGS = (
+    ('br', '.br'),
+    ('gzip', '.gz'),
+)
+
+
+class RangedFile:
+    # fileno() не отдаётся намеренно: wsgi.file_wrapper на sendfile
+    # отправил бы файл до конца, а не только запрошенный диапазон.
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        length = min(int(end), size)
+        if not length:
+            raise ValueError
+        return size - length, size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        raise ValueError
+    return start, end
+
+
+def if_range_passes(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def resolve(root, path):
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404
+    try:
+        fullpath = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        file_stat = os.stat(fullpath)
+    except OSError:
+        raise Http404
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404
+    return fullpath, file_stat
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def file_etag(file_stat):
+    return quote_etag(f'{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}')
+
+
+def serve_file(request, fullpath, file_stat, *, etag, cache_control,
+               accel_path=None, content_type=None, content_encoding=None,
+               compressible=False):
+    last_modified = int(file_stat.st_mtime)
+    if content_type is None:
+        content_type, _ = mimetypes.guess_type(fullpath)
+    headers = HttpResponse(content_type=content_type)
+    headers['ETag'] = etag
+    headers['Last-Modified'] = http_date(last_modified)
+    headers['Cache-Control'] = cache_control
+    headers['Accept-Ranges'] = 'bytes'
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    if compressible:
+        patch_vary_headers(headers, ('Accept-Encoding',))
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=headers
+    )
+    if conditional is not headers:
+        return conditional
+    accel_header = settings.MEDIA_ACCEL_HEADER
+    if accel_header and accel_path:
+        headers[accel_header] = (
+            fullpath if accel_header == 'X-Sendfile' else accel_path
+        )
+        return headers
+
+    response = file_response(
+        request, fullpath, file_stat.st_size, content_type,
+        if_range_passes(request, etag, last_modified),
+    )
+    for header, value in headers.items():
+        if header != 'Content-Type':
+            response[header] = value
+    return response
+
+
+def file_response(request, fullpath, size, content_type, use_range):
+    byte_range = None
+    if use_range and request.META.get('HTTP_RANGE'):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    # Целый файл FileResponse отдаёт через wsgi.file_wrapper, и сервер
+    # может использовать os.sendfile; диапазон читается через RangedFile.
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+    start, end = byte_range
+    response = FileResponse(
+        RangedFile(file, start, end - start + 1),
+        status=206,
+        content_type=content_type,
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    fullpath, file_stat = resolve(settings.MEDIA_ROOT, path)
+    if is_content_addressed(path):
+        etag = quote_etag(os.path.splitext(os.path.basename(path))[0])
+        cache_control = (
+            f'public, max-age={IMMUTABLE_CACHE_MAX_AGE}, immutable'
+        )
+    else:
+        etag = file_etag(file_stat)
+        cache_control = f'public, max-age={MEDIA_CACHE_MAX_AGE}'
+    return serve_file(
+        request,
+        fullpath,
+        file_stat,
+        etag=etag,
+        cache_control=cache_control,
+        accel_path=settings.MEDIA_ACCEL_PREFIX + path,
+    )
+
+
+@require_safe
+def serve_static(request, path):
+    fullpath, file_stat = resolve(settings.STATIC_ROOT, path)
+    content_type, _ = mimetypes.guess_type(fullpath)
+    compressible = os.path.splitext(path)[1] in COMPRESSIBLE_EXTENSIONS
+    content_encoding = None
+    if compressible:
+        accepted = accepted_encodings(request)
+        for coding, suffix in STATIC_ENCODINGS:
+            if coding not in accepted:
+                continue
+            try:
+                encoded_stat = os.stat(fullpath + suffix)
+            except OSError:
+                continue
+            fullpath, file_stat = fullpath + suffix, encoded_stat
+            content_encoding = coding
+            break
+    if HASHED_STATIC_RE.search(path):
+        cache_control = (
+            f'public, max-age={IMMUTABLE_CACHE_MAX_AGE}, immutable'
+        )
+    else:
+        cache_control = f'public, max-age={STATIC_CACHE_MAX_AGE}'
+    return serve_file(
+        request,
+        fullpath,
+        file_stat,
+        etag=file_etag(file_stat),
+        cache_control=cache_control,
+        content_type=content_type,
+        content_encoding=content_encoding,
+        compressible=compressible,
+    )
+
+
+@require_safe
+def serve_sitemap(request, name='sitemap.xml'):
+    fullpath, file_stat = resolve(settings.SITEMAP_ROOT, name)
+    # Части лежат на диске уже сжатыми и отдаются как есть.
+    content_type = (
+        'application/gzip' if name.endswith('.gz') else 'application/xml'
+    )
+    return serve_file(
+        request,
+        fullpath,
+        file_stat,
+        etag=file_etag(file_stat),
+        cache_control=f'public, max-age={SITEMAP_CACHE_MAX_AGE}',
+        content_type=content_type,
+    )
+
+
+@require_safe
+@never_cache
+@staff_member_required
+def throttle_metrics(request):
+    return JsonResponse(metrics())
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from blog.purge import hide_user
+from .forms import UserChangeForm
+
+User = get_user_model()
+
+
+@admin.action(description='Удалить в фоне')
+def schedule_deletion(modeladmin, request, queryset):
+    for user in queryset:
+        hide_user(user)
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class ScheduledDeletionUserAdmin(UserAdmin):
+    # Стандартное удаление строит в запросе полный граф связанных
+    # объектов. Пользователь скрывается сразу, а удаляет его
+    # purge_deleted.
+    actions = (schedule_deletion,)
+    form = UserChangeForm
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,9 +1,37 @@
-from django.contrib.auth import get_user_model
+from django.contrib.auth import forms as auth_forms, get_user_model
+from django.db.models import CharField, Func, Value
+from django.db.models.functions import Lower
 
 from django import forms
 
 
-class UserCreationForm(forms.ModelForm):
+class EmailKey(Func):
+    # Текст выражения повторяет уникальный индекс из миграции
+    # users.0002_email_lower_unique, поэтому пустая строка записана
+    # в шаблоне, а не передана параметром: иначе индекс не подойдёт.
+    template = "NULLIF(LOWER(%(expressions)s), '')"
+    output_field = CharField()
+
+
+def users_by_email(email):
+    # Правую часть к нижнему регистру тоже приводит СУБД,
+    # чтобы правила совпадали с индексом.
+    return get_user_model().objects.alias(
+        email_key=EmailKey('email')
+    ).filter(email_key=Lower(Value(email)))
+
+
+class UniqueEmailMixin:
+    def clean_email(self):
+        email = self.cleaned_data['email']
+        if email and users_by_email(email).exclude(
+            pk=self.instance.pk
+        ).exists():
+            raise forms.ValidationError('E-mail такой существует')
+        return email
+
+
+class UserCreationForm(UniqueEmailMixin, forms.ModelForm):
     class Meta:
         model = get_user_model()
         fields = (
@@ -17,8 +45,25 @@ class UserCreationForm(forms.ModelForm):
             'password': forms.PasswordInput(),
         }
 
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if get_user_model().objects.filter(email=email).exists():
-            raise forms.ValidationError('E-mail такой существует')
-        return email
+
+class ProfileForm(UniqueEmailMixin, forms.ModelForm):
+    class Meta:
+        model = get_user_model()
+        fields = (
+            'username',
+            'first_name',
+            'last_name',
+            'email',
+        )
+
+
+class UserChangeForm(UniqueEmailMixin, auth_forms.UserChangeForm):
+    pass
+
+
+class PasswordResetForm(auth_forms.PasswordResetForm):
+    def get_users(self, email):
+        return (
+            user for user in users_by_email(email).filter(is_active=True)
+            if user.has_usable_password()
+        )
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+# Пустой e-mail превращается в NULL и в уникальности не участвует:
+# у многих пользователей адрес не указан.
+CREATE_INDEX = (
+    'CREATE UNIQUE INDEX auth_user_email_lower_uniq '
+    "ON auth_user (NULLIF(LOWER(email), ''))"
+)
+DROP_INDEX = 'DROP INDEX auth_user_email_lower_uniq'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+
+class ScheduledDeletion(models.Model):
+    user = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+        related_name='deletion',
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'удаление пользователя'
+        verbose_name_plural = 'Удаление пользователей'
+
+    def __str__(self):
+        return str(self.user)
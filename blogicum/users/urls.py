@@ -1,19 +1,42 @@
 from django.urls import path
 from django.contrib.auth import views
 
+from blogicum.constants import (
+    LOGIN_IP_LIMIT,
+    LOGIN_USERNAME_LIMIT,
+    REGISTRATION_IP_LIMIT,
+)
+from core.throttle import throttle
+from .forms import PasswordResetForm
 from .views import UserCreate
 
-
 urlpatterns = [
-    path('registration/', UserCreate.as_view(), name='registration'),
-    path('login/', views.LoginView.as_view(), name='login'),
+    path(
+        'registration/',
+        throttle('registration', ip_limit=REGISTRATION_IP_LIMIT)(
+            UserCreate.as_view()
+        ),
+        name='registration',
+    ),
+    path(
+        'login/',
+        throttle(
+            'login',
+            ip_limit=LOGIN_IP_LIMIT,
+            username_limit=LOGIN_USERNAME_LIMIT,
+        )(views.LoginView.as_view()),
+        name='login',
+    ),
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('password_change/', views.PasswordChangeView.as_view(),
         name='password_change'),
     path('password_change/done/', views.PasswordChangeDoneView.as_view(),
         name='password_change_done'),
-    path('password_reset/', views.PasswordResetView.as_view(),
-        name='password_reset'),
+    path(
+        'password_reset/',
+        views.PasswordResetView.as_view(form_class=PasswordResetForm),
+        name='password_reset',
+    ),
     path('password_reset/done/', views.PasswordResetDoneView.as_view(),
         name='password_reset_done'),
     path('reset/<uidb64>/<token>/', views.PasswordResetConfirmView.as_view(),
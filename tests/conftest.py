@@ -41,6 +41,11 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def temporary_media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,86 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    if response.streaming:
+        return json.loads(b''.join(response.streaming_content))
+    return response.json()
+
+
+def test_post_list_keyset_pagination(
+    client, mixer, user, published_category, future_posts
+):
+    same_time = timezone.now() - timedelta(hours=1)
+    posts = mixer.cycle(5).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=same_time,
+    )
+    ids = []
+    url = '/api/v1/posts/'
+    params = {'limit': 2, 'fields': 'id,title'}
+    while url:
+        page = get_json(client, url, **params)
+        for item in page['results']:
+            assert set(item) == {'id', 'title'}, (
+                'Убедитесь, что API возвращает только запрошенные поля.'
+            )
+            ids.append(item['id'])
+        url, params = page['next'], {}
+    assert ids == sorted((post.id for post in posts), reverse=True), (
+        'Убедитесь, что постраничный вывод API не теряет и не повторяет '
+        'публикации с одинаковой датой.'
+    )
+
+
+def test_post_visibility(client, user_client, future_posts):
+    post = future_posts[0]
+    assert client.get(
+        f'/api/v1/posts/{post.id}/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    item = get_json(user_client, f'/api/v1/posts/{post.id}/')
+    assert item['id'] == post.id
+    assert item['author'] == post.author.username
+
+
+def test_comments_and_categories(client, comment_to_a_post):
+    post = comment_to_a_post.post
+    page = get_json(client, f'/api/v1/posts/{post.id}/comments/')
+    assert [item['message'] for item in page['results']] == [
+        comment_to_a_post.message
+    ]
+    page = get_json(client, '/api/v1/categories/')
+    assert post.category.slug in [item['slug'] for item in page['results']]
+
+
+@pytest.mark.parametrize('params', (
+    {'fields': 'password'},
+    {'limit': 'many'},
+    {'cursor': 'broken'},
+))
+def test_bad_parameters(client, params):
+    response = client.get('/api/v1/posts/', params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_page_is_read_before_streaming(
+    client, post_with_published_location, django_assert_num_queries
+):
+    response = client.get('/api/v1/posts/')
+    assert response.streaming
+    with django_assert_num_queries(0):
+        page = json.loads(b''.join(response.streaming_content))
+    assert page['results'][0]['id'] == post_with_published_location.id, (
+        'Убедитесь, что страница читается из базы до отдачи ответа: '
+        'под ASGI потоковый ответ перебирается вне потока с ORM.'
+    )
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.archive import month_of
+from blog.models import ArchiveMonth, Post
+from blog.signals import post_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+def totals():
+    return dict(
+        ((row.year, row.month), row.post_count)
+        for row in ArchiveMonth.objects.filter(category=None)
+    )
+
+
+def test_counts_follow_writes(post_with_published_location, future_posts):
+    post = post_with_published_location
+    month = month_of(post.pub_date)
+    assert totals() == {month: 1}, (
+        'Убедитесь, что в архиве учитываются только видимые публикации.'
+    )
+    assert ArchiveMonth.objects.get(
+        category=post.category
+    ).post_count == 1
+    post.is_published = False
+    post.save()
+    assert totals() == {}
+    post.is_published = True
+    post.save()
+    post.category.is_published = False
+    post.category.save()
+    assert totals() == {}
+
+
+def test_scheduler_publishes_due_posts(mixer, user, published_category):
+    call_command('publish_scheduled')
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert totals() == {}
+    received = []
+
+    def receiver(instance, **kwargs):
+        received.append(instance.pk)
+
+    post_published.connect(receiver, sender=Post)
+    Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+    try:
+        call_command('publish_scheduled')
+    finally:
+        post_published.disconnect(receiver, sender=Post)
+    post.refresh_from_db()
+    assert received == [post.pk], (
+        'Убедитесь, что при наступлении даты отправляется post_published.'
+    )
+    assert totals() == {month_of(post.pub_date): 1}
+
+
+def test_archive_pages(client, post_with_published_location):
+    post = post_with_published_location
+    year, month = month_of(post.pub_date)
+    response = client.get('/archive/')
+    assert response.status_code == HTTPStatus.OK
+    assert f'/archive/{year}/{month}/' in response.content.decode('utf-8')
+    response = client.get(f'/archive/{year}/{month}/')
+    assert list(response.context['page_obj']) == [post]
+    assert client.get(
+        f'/archive/{year}/13/'
+    ).status_code == HTTPStatus.NOT_FOUND
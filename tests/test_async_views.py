@@ -0,0 +1,94 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIHandler
+from django.http import Http404
+from django.test import RequestFactory
+
+from blog import async_views
+
+# Представления выполняются в потоках отдельного пула, которым нужны
+# зафиксированные в БД данные.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def asgi_get(path):
+    # AsyncClient отдаёт потоковый ответ целиком в тестовом потоке,
+    # поэтому запрос проходит через сам ASGIHandler, как у сервера.
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 40000),
+        'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(ASGIHandler())(scope, receive, send)
+    start, *body = messages
+    return start['status'], b''.join(part.get('body', b'') for part in body)
+
+
+def call(view, path, **kwargs):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+def test_async_views_render_in_pool(post_with_published_location):
+    post = post_with_published_location
+    for view, path, kwargs in (
+        (async_views.posts_list, '/', {}),
+        (
+            async_views.category_posts,
+            f'/category/{post.category.slug}/',
+            {'slug': post.category.slug},
+        ),
+        (
+            async_views.post_detail,
+            f'/posts/{post.id}/',
+            {'post_id': post.id},
+        ),
+    ):
+        response = call(view, path, **kwargs)
+        assert response.status_code == HTTPStatus.OK
+        assert response.is_rendered, (
+            'Убедитесь, что шаблон отрисовывается в пуле потоков, '
+            'а не в цикле событий.'
+        )
+        assert post.title in response.content.decode('utf-8')
+
+
+def test_async_detail_hides_unpublished(future_posts):
+    with pytest.raises(Http404):
+        call(
+            async_views.post_detail,
+            f'/posts/{future_posts[0].id}/',
+            post_id=future_posts[0].id,
+        )
+
+
+def test_streaming_api_under_asgi(post_with_published_location):
+    status, body = asgi_get('/api/v1/posts/')
+    assert status == HTTPStatus.OK, (
+        'Убедитесь, что потоковые ответы API работают под ASGI.'
+    )
+    assert json.loads(body)['results'][0]['id'] == (
+        post_with_published_location.id
+    )
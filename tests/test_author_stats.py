@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import AuthorStats, Post
+from blog.purge import hide_post
+from blog.signals import post_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stats_of(user):
+    return AuthorStats.objects.values_list(
+        'post_count', 'comment_count', 'last_post_at'
+    ).get(user=user)
+
+
+def test_stats_follow_posts_and_comments(
+        mixer, user, another_user, published_category
+):
+    now = timezone.now()
+    older, newer = (
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=now - timedelta(days=days),
+        )
+        for days in (2, 1)
+    )
+    comment = mixer.blend('blog.Comment', post=older, author=user)
+    mixer.blend('blog.Comment', post=older, author=another_user)
+    assert stats_of(user) == (2, 1, newer.pub_date), (
+        'Убедитесь, что статистика автора обновляется при добавлении '
+        'публикаций и комментариев.'
+    )
+    hide_post(newer)
+    comment.delete()
+    assert stats_of(user) == (1, 0, older.pub_date), (
+        'Убедитесь, что удаление публикации и комментария уменьшает '
+        'счётчики и пересчитывает дату последней публикации.'
+    )
+    assert stats_of(another_user) == (0, 1, None)
+
+
+def test_stats_count_only_visible_posts(mixer, user, published_category):
+    now = timezone.now()
+    visible = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=now - timedelta(days=1), is_published=True,
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=now - timedelta(hours=1), is_published=False,
+    )
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=now + timedelta(days=1), is_published=True,
+    )
+    assert stats_of(user) == (1, 0, visible.pub_date), (
+        'Убедитесь, что отложенные и снятые с публикации записи '
+        'не учитываются в статистике автора.'
+    )
+    Post.objects.filter(pk=scheduled.pk).update(pub_date=now)
+    scheduled.refresh_from_db()
+    post_published.send(sender=Post, instance=scheduled)
+    assert stats_of(user) == (2, 0, scheduled.pub_date), (
+        'Убедитесь, что статистика обновляется, когда наступает дата '
+        'отложенной публикации.'
+    )
+    published_category.is_published = False
+    published_category.save()
+    assert stats_of(user) == (0, 0, None), (
+        'Убедитесь, что публикации скрытой категории не учитываются.'
+    )
+
+
+def test_reconcile_fixes_drift(mixer, user, another_user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    AuthorStats.objects.filter(user=user).update(post_count=7)
+    AuthorStats.objects.filter(user=another_user).delete()
+    call_command('reconcile_author_stats')
+    assert stats_of(user) == (1, 0, post.pub_date)
+    assert stats_of(another_user) == (0, 1, None), (
+        'Убедитесь, что сверка восстанавливает недостающие строки.'
+    )
+
+
+def test_profile_loads_stats_with_user(
+        mixer, client, user, published_category, django_assert_num_queries
+):
+    mixer.blend('blog.Post', author=user, category=published_category)
+    response = client.get(f'/profile/{user.username}/')
+    with django_assert_num_queries(0):
+        post_count = response.context['profile'].stats.post_count
+    assert post_count == 1, (
+        'Убедитесь, что профиль загружается вместе со статистикой.'
+    )
+    assert 'Публикаций: 1' in response.content.decode()
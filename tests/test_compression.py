@@ -0,0 +1,68 @@
+import gzip
+from http import HTTPStatus
+
+import brotli
+import pytest
+from django.core.cache import caches
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+
+from core.middleware import CompressionMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_is_compressed(client, many_posts_with_published_locations):
+    plain = client.get('/').content
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+    assert response['Content-Encoding'] == 'br', (
+        'Убедитесь, что страницы сжимаются brotli, если клиент его'
+        ' поддерживает.'
+    )
+    assert 'Accept-Encoding' in response['Vary']
+    assert brotli.decompress(response.content) == plain
+
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert gzip.decompress(response.content) == plain
+
+
+def test_streaming_response_is_compressed_incrementally():
+    chunks = [b'<p>travel</p>' * 50] * 5
+
+    def get_response(request):
+        return StreamingHttpResponse(iter(chunks), content_type='text/html')
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    response = CompressionMiddleware(get_response)(request)
+    parts = list(response.streaming_content)
+    assert len(parts) > 1
+    assert gzip.decompress(b''.join(parts)) == b''.join(chunks)
+
+
+def test_images_are_not_recompressed(client, post_with_published_location):
+    url = '/' + post_with_published_location.image.url.lstrip('/')
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+    assert response.status_code == HTTPStatus.OK
+    assert not response.has_header('Content-Encoding')
+
+
+def test_only_public_pages_are_cached(
+        client, user_client, many_posts_with_published_locations
+):
+    cache = caches[CompressionMiddleware.cache_alias]
+    cache.clear()
+    response = user_client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
+    assert not cache._cache, (
+        'Убедитесь, что сжатые личные страницы не попадают в кеш.'
+    )
+    client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert len(cache._cache) == 1
+
+
+def test_pages_with_csrf_token_are_not_compressed(client):
+    response = client.get('/auth/login/', HTTP_ACCEPT_ENCODING='gzip, br')
+    assert response.status_code == HTTPStatus.OK
+    assert not response.has_header('Content-Encoding'), (
+        'Убедитесь, что страницы с CSRF-токеном не сжимаются (BREACH).'
+    )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_not_modified(mixer, user, client, published_category):
+    mixer.blend('blog.Post', author=user, category=published_category)
+    response = client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    etag = response['ETag']
+    response = client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что неизменившаяся лента отдаётся с кодом 304.'
+    )
+
+    mixer.blend('blog.Post', author=user, category=published_category)
+    response = client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_index_not_modified_without_aggregate(
+        mixer, user, client, published_category
+):
+    mixer.blend('blog.Post', author=user, category=published_category)
+    etag = client.get('/')['ETag']
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+    ], 'Убедитесь, что ответ 304 не пересчитывает публикации.'
+
+
+def test_post_detail_not_modified(
+    mixer, user, user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    etag = user_client.get(url)['ETag']
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после нового комментария страница поста'
+        ' отдаётся заново.'
+    )
+
+
+def test_post_detail_etag_is_per_user(
+    user_client, another_user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    etag = user_client.get(url)['ETag']
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
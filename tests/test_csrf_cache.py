@@ -0,0 +1,35 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_public(client, post_with_published_location):
+    for url in ('/', f'/posts/{post_with_published_location.pk}/'):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'public' in response['Cache-Control'], (
+            'Убедитесь, что страницы для анонимных посетителей '
+            'разрешено хранить в общем кеше.'
+        )
+        assert not response.cookies
+
+
+def test_authenticated_forms_embed_token(user, post_with_published_location):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    url = f'/posts/{post_with_published_location.pk}/'
+    response = client.get(url)
+    assert 'private' in response['Cache-Control']
+    token = response.context['csrf_token']
+    assert str(token) in response.content.decode('utf-8'), (
+        'Убедитесь, что форма комментария содержит CSRF-токен и работает '
+        'без JavaScript.'
+    )
+    response = client.post(
+        f'{url}comment/',
+        {'message': 'Текст', 'csrfmiddlewaretoken': str(token)},
+    )
+    assert response.status_code == HTTPStatus.FOUND
@@ -0,0 +1,100 @@
+import os
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+
+from users.forms import UserChangeForm, UserCreationForm, users_by_email
+
+pytestmark = [pytest.mark.django_db]
+
+LARGE_USERS = 10 ** 6
+LOOKUPS = 1000
+
+
+def test_lookup_uses_index():
+    assert 'auth_user_email_lower_uniq' in users_by_email(
+        'reader@example.com'
+    ).explain(), 'Убедитесь, что поиск по e-mail идёт по индексу.'
+
+
+def test_case_variants_found(client, user):
+    user.email = 'Reader@Example.com'
+    user.save()
+    form = UserCreationForm(data={
+        'username': 'another',
+        'password': 'password',
+        'email': 'READER@example.COM',
+    })
+    assert 'email' in form.errors, (
+        'Убедитесь, что e-mail проверяется без учёта регистра.'
+    )
+    client.post('/auth/password_reset/', {'email': 'reader@example.com'})
+    assert [message.to for message in mail.outbox] == [[user.email]]
+
+
+def test_profile_email_taken_case_insensitively(
+        user_client, user, another_user
+):
+    another_user.email = 'Reader@Example.com'
+    another_user.save()
+    response = user_client.post(f'/profile/{user.username}/edit/', {
+        'username': user.username,
+        'email': 'READER@example.COM',
+    })
+    assert 'email' in response.context['form'].errors, (
+        'Убедитесь, что при редактировании профиля e-mail проверяется '
+        'без учёта регистра.'
+    )
+    response = user_client.post(f'/profile/{user.username}/edit/', {
+        'username': user.username,
+        'email': user.email.upper(),
+    })
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Убедитесь, что собственный e-mail не считается занятым.'
+    )
+    form = UserChangeForm(instance=user, data={
+        'username': user.username,
+        'email': 'reader@example.com',
+        'date_joined': user.date_joined,
+    })
+    assert 'email' in form.errors, (
+        'Убедитесь, что e-mail проверяется и в админке.'
+    )
+
+
+def insert_users(first, last):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO auth_user (password, is_superuser, username, '
+            'first_name, last_name, email, is_staff, is_active, date_joined) '
+            "VALUES ('!', 0, %s, '', '', %s, 0, 1, '2000-01-01')",
+            (
+                (f'user{number}', f'User{number}@Example.com')
+                for number in range(first, last)
+            ),
+        )
+
+
+def lookup_time(count):
+    started = time.perf_counter()
+    for number in range(LOOKUPS):
+        users_by_email(f'user{number * 7919 % count}@example.com').exists()
+    return time.perf_counter() - started
+
+
+@pytest.mark.skipif(
+    not os.environ.get('BLOGICUM_LARGE_TESTS'),
+    reason='Заполняет таблицу миллионом пользователей.',
+)
+def test_lookup_time_does_not_grow_with_users():
+    insert_users(0, LOOKUPS)
+    small = lookup_time(LOOKUPS)
+    insert_users(LOOKUPS, LARGE_USERS)
+    large = lookup_time(LARGE_USERS)
+    assert large < small * 3, (
+        f'Проверка e-mail при {LARGE_USERS} пользователях заняла '
+        f'{large:.3f} с против {small:.3f} с при {LOOKUPS}.'
+    )
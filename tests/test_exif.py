@@ -0,0 +1,97 @@
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from blog import exif
+from blog.forms import PostForm
+from blog.models import Location
+
+pytestmark = [pytest.mark.django_db]
+
+TAKEN_AT = datetime(2020, 5, 17, 10, 30)
+LATITUDE, LONGITUDE = 55.75, 37.625
+
+
+def photo():
+    metadata = Image.Exif()
+    metadata[exif.TAG_ORIENTATION] = 6
+    metadata[exif.EXIF_IFD] = {
+        exif.TAG_DATETIME_ORIGINAL: TAKEN_AT.strftime(
+            exif.EXIF_DATETIME_FORMAT
+        ),
+    }
+    metadata[exif.GPS_IFD] = {
+        exif.GPS_LATITUDE_REF: 'N',
+        exif.GPS_LATITUDE: (55.0, 45.0, 0.0),
+        exif.GPS_LONGITUDE_REF: 'E',
+        exif.GPS_LONGITUDE: (37.0, 37.0, 30.0),
+    }
+    buffer = BytesIO()
+    Image.new('RGB', (8, 8)).save(buffer, 'JPEG', exif=metadata)
+    return SimpleUploadedFile(
+        'photo.jpg', buffer.getvalue(), content_type='image/jpeg'
+    )
+
+
+def post_form(category, image):
+    return PostForm(
+        data={'title': 'Заголовок', 'text': 'Текст', 'category': category.pk},
+        files={'image': image},
+    )
+
+
+def test_strip_keeps_jfif_first_and_orientation_only():
+    stripped = exif.strip_metadata(photo(), orientation=6).read()
+    assert stripped[2:4] == b'\xff\xe0', (
+        'Убедитесь, что сегмент JFIF (APP0) остаётся сразу после SOI.'
+    )
+    assert exif.parse_metadata(stripped) == exif.PhotoMetadata(
+        orientation=6
+    ), (
+        'Убедитесь, что из фотографии удаляются дата съёмки и координаты, '
+        'а ориентация сохраняется.'
+    )
+    with Image.open(BytesIO(stripped)) as image:
+        image.load()
+
+
+def test_form_fills_pub_date_from_photo(published_category):
+    form = post_form(published_category, photo())
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data['pub_date'] == timezone.make_aware(TAKEN_AT), (
+        'Убедитесь, что пустая дата публикации берётся из даты съёмки.'
+    )
+
+
+def test_location_resolved_only_on_save(published_category, user):
+    invalid = PostForm(
+        data={'title': '', 'text': 'Текст'}, files={'image': photo()}
+    )
+    assert not invalid.is_valid()
+    form = post_form(published_category, photo())
+    assert form.is_valid(), form.errors
+    assert not Location.objects.exists(), (
+        'Убедитесь, что проверка формы не создаёт местоположений.'
+    )
+    post = form.save(commit=False)
+    post.author = user
+    post.save()
+    location = post.location
+    assert location is not None
+    assert not location.is_published, (
+        'Убедитесь, что место из координат фотографии не публикуется '
+        'автоматически.'
+    )
+    assert (location.latitude, location.longitude) == pytest.approx(
+        (LATITUDE, LONGITUDE)
+    )
+    nearby = post_form(published_category, photo())
+    assert nearby.is_valid(), nearby.errors
+    nearby.instance.author = user
+    assert nearby.save().location == location, (
+        'Убедитесь, что для близких координат используется найденное место.'
+    )
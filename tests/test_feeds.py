@@ -0,0 +1,78 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.mark.parametrize('url', ('/feeds/rss/', '/feeds/atom/'))
+def test_site_feed(client, url, post_with_published_location, future_posts):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode('utf-8')
+    assert post_with_published_location.title in content
+    for post in future_posts:
+        assert post.title not in content, (
+            'Убедитесь, что отложенные публикации не попадают в ленту.'
+        )
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_category_and_author_feeds(
+    client, post_with_published_location, post_with_another_category,
+    post_of_another_author
+):
+    category = post_with_published_location.category
+    content = client.get(
+        f'/feeds/category/{category.slug}/rss/'
+    ).content.decode('utf-8')
+    assert post_with_published_location.title in content
+    assert post_with_another_category.title not in content
+
+    author = post_of_another_author.author
+    content = client.get(
+        f'/feeds/author/{author.username}/atom/'
+    ).content.decode('utf-8')
+    assert post_of_another_author.title in content
+    assert post_with_published_location.title not in content
+
+
+def test_feed_refreshes_after_write(client, mixer, user, published_category):
+    url = '/feeds/rss/'
+    etag = client.get(url)['ETag']
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() - timedelta(minutes=1),
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode('utf-8')
+
+
+def test_feed_links_and_descriptions(client, post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Tom & Jerry'
+    post.save(update_fields=('text',))
+    call_command('render_posts')
+    content = client.get('/feeds/atom/').content.decode('utf-8')
+    assert (
+        f'<uri>http://testserver/profile/{post.author.username}/</uri>'
+        in content
+    ), 'Убедитесь, что ссылка на автора в ленте абсолютная.'
+    content = client.get('/feeds/rss/').content.decode('utf-8')
+    assert 'Tom &amp; Jerry' in content
+    assert '&amp;amp;' not in content, (
+        'Убедитесь, что описание записи в ленте экранируется один раз.'
+    )
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog import fanout
+from blog.models import FeedEntry, Follow, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed(user, celebrities):
+    return list(fanout.personal_feed(
+        Post.objects.published(), user, celebrities
+    ))
+
+
+def test_follow_toggle(another_user_client, user, another_user):
+    url = f'/profile/{user.username}/follow/'
+    assert another_user_client.get(url).status_code == (
+        HTTPStatus.METHOD_NOT_ALLOWED
+    )
+    response = another_user_client.post(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert Follow.objects.filter(follower=another_user, author=user).exists()
+    another_user_client.post(url)
+    assert not Follow.objects.exists(), (
+        'Убедитесь, что повторный запрос отменяет подписку.'
+    )
+
+
+def test_fan_out_fills_inbox(post_with_published_location, another_user):
+    post = post_with_published_location
+    Follow.objects.create(follower=another_user, author=post.author)
+    assert feed(another_user, frozenset()) == []
+    assert fanout.fan_out(post.pk) == 1
+    assert feed(another_user, frozenset()) == [post], (
+        'Убедитесь, что публикация попадает в ленту подписчика.'
+    )
+    fanout.drop_follow(another_user.pk, post.author.pk)
+    assert not FeedEntry.objects.exists()
+
+
+def test_celebrity_posts_merged_on_read(
+        post_with_published_location, another_user
+):
+    post = post_with_published_location
+    Follow.objects.create(follower=another_user, author=post.author)
+    celebrities = frozenset((post.author.pk,))
+    assert feed(another_user, celebrities) == [post], (
+        'Убедитесь, что публикации популярных авторов подмешиваются '
+        'при чтении ленты.'
+    )
+    assert not FeedEntry.objects.exists()
+
+
+def test_follow_feed_page(another_user_client, post_with_published_location):
+    response = another_user_client.get('/feed/')
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['page_obj']) == []
+
+
+def test_backfill_when_author_drops_below_limit(
+        monkeypatch, mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    monkeypatch.setattr(fanout, 'FANOUT_FOLLOWER_LIMIT', 2)
+    Follow.objects.create(follower=another_user, author=post.author)
+    leaving = Follow.objects.create(
+        follower=mixer.blend('auth.User'), author=post.author
+    )
+    assert post.author.pk in fanout.celebrity_ids()
+    leaving.delete()
+    assert fanout.dropped_below_limit(post.author.pk)
+    assert fanout.backfill_author(post.author.pk) == 1
+    assert feed(another_user, fanout.celebrity_ids()) == [post], (
+        'Убедитесь, что публикации автора, переставшего быть популярным, '
+        'дописываются в ленты подписчиков.'
+    )
+
+
+def test_feed_pages_read_inbox_by_date(
+        mixer, another_user_client, user, another_user, published_category
+):
+    Follow.objects.create(follower=another_user, author=user)
+    now = timezone.now()
+    posts = [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True, pub_date=now - timedelta(hours=hours),
+        )
+        for hours in range(1, 13)
+    ]
+    for post in posts:
+        fanout.fan_out(post.pk)
+    pages = [
+        list(another_user_client.get(
+            '/feed/', {'page': page}
+        ).context['page_obj'])
+        for page in (1, 2)
+    ]
+    assert pages == [posts[:10], posts[10:]], (
+        'Убедитесь, что лента подписок делится на страницы по дате.'
+    )
+    plan = fanout.personal_feed(
+        Post.objects.published(), another_user, frozenset(), limit=10
+    ).explain()
+    assert 'blog_feeden_owner_i' in plan, (
+        'Убедитесь, что лента читается по индексу (owner, pub_date).'
+    )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+@pytest.fixture
+def media_url(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    name = default_storage.save(
+        'img_publications/file.txt', ContentFile(b'0123456789')
+    )
+    return f'/media/{name}'
+
+
+def read(response):
+    return b''.join(response.streaming_content)
+
+
+def test_hashed_media_is_immutable(client, media_url):
+    response = client.get(media_url)
+    assert response.status_code == HTTPStatus.OK
+    assert read(response) == b'0123456789'
+    assert 'immutable' in response['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени кешируются надолго.'
+    )
+    response = client.get(
+        media_url, HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_media_range_requests(client, media_url):
+    response = client.get(media_url, HTTP_RANGE='bytes=2-4')
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response['Content-Range'] == 'bytes 2-4/10'
+    assert not hasattr(response.file_to_stream, 'fileno'), (
+        'Убедитесь, что sendfile не может отправить файл за пределами '
+        'диапазона.'
+    )
+    assert read(response) == b'234'
+
+    response = client.get(media_url, HTTP_RANGE='bytes=-3')
+    assert read(response) == b'789'
+
+    response = client.get(media_url, HTTP_RANGE='bytes=20-')
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+    response = client.get(media_url, HTTP_RANGE='bytes=-0')
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+    response = client.get(
+        media_url, HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_media_accel_redirect(client, media_url, settings):
+    settings.MEDIA_ACCEL_HEADER = 'X-Accel-Redirect'
+    response = client.get(media_url)
+    assert response['X-Accel-Redirect'] == (
+        settings.MEDIA_ACCEL_PREFIX + media_url[len('/media/'):]
+    )
+    assert not response.content
+
+
+def test_media_hidden_files(client, media_url):
+    assert client.get('/media/.incoming/x').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert client.get('/media/../manage.py').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from core.models import StoredFile
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_same_content_stored_once(
+    mixer, user, published_category, settings, tmp_path
+):
+    settings.MEDIA_ROOT = tmp_path
+    posts = mixer.cycle(2).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        image=mixer.sequence(
+            ContentFile(b'same bytes', name='first.png'),
+            ContentFile(b'same bytes', name='second.png'),
+        ),
+    )
+    assert posts[0].image.name == posts[1].image.name, (
+        'Убедитесь, что одинаковые изображения хранятся в одном файле.'
+    )
+    stored = StoredFile.objects.get(name=posts[0].image.name)
+    assert stored.references == 2
+
+    posts[0].delete()
+    call_command('collect_media', grace=0)
+    assert default_storage.exists(posts[1].image.name), (
+        'Убедитесь, что файл, на который ещё ссылается пост, не удаляется.'
+    )
+
+    posts[1].delete()
+    call_command('collect_media', grace=0)
+    assert not default_storage.exists(posts[1].image.name), (
+        'Убедитесь, что сборщик мусора удаляет файлы без ссылок.'
+    )
+
+
+def test_reused_file_survives_collection(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    name = default_storage.save('a.png', ContentFile(b'reused bytes'))
+    path = default_storage.path(name)
+    os.utime(path, (0, 0))
+    assert default_storage.save('b.png', ContentFile(b'reused bytes')) == name
+    # Ссылка ещё не записана: сохранение уже есть, post_save ещё нет.
+    call_command('collect_media')
+    assert default_storage.exists(name), (
+        'Убедитесь, что повторно загруженный файл не удаляется сборщиком '
+        'до того, как на него появится ссылка.'
+    )
@@ -0,0 +1,32 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from blog.models import CommentNotification
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comments_collected_into_digest(
+        mixer, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    user.email = 'author@example.com'
+    user.save()
+    mixer.cycle(2).blend('blog.Comment', post=post, author=another_user)
+    mixer.blend('blog.Comment', post=post, author=user)
+    assert CommentNotification.objects.count() == 3
+    call_command('send_digests')
+    assert len(mail.outbox) == 1, (
+        'Убедитесь, что автор получает одну сводку вместо письма '
+        'на каждый комментарий.'
+    )
+    digest = mail.outbox[0]
+    assert digest.to == [user.email]
+    assert f'«{post.title}» — 2' in digest.body, (
+        'Убедитесь, что собственные комментарии автора не попадают '
+        'в сводку.'
+    )
+    assert not CommentNotification.objects.exists()
+    call_command('send_digests')
+    assert len(mail.outbox) == 1
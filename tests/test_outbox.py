@@ -0,0 +1,57 @@
+import smtplib
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from core.models import OutboxMessage
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def outbox_settings(settings):
+    settings.EMAIL_BACKEND = 'core.mail.OutboxBackend'
+    settings.OUTBOX_DELIVERY_BACKEND = (
+        'django.core.mail.backends.locmem.EmailBackend'
+    )
+    return settings
+
+
+def test_password_reset_is_queued(outbox_settings, client, user):
+    user.email = 'reader@example.com'
+    user.save()
+    response = client.post('/auth/password_reset/', {'email': user.email})
+    assert response.status_code == HTTPStatus.FOUND
+    assert mail.outbox == [], (
+        'Убедитесь, что запрос только ставит письмо в очередь.'
+    )
+    assert OutboxMessage.objects.filter(
+        status=OutboxMessage.PENDING
+    ).count() == 1
+    call_command('send_outbox')
+    assert [message.to for message in mail.outbox] == [[user.email]]
+    assert OutboxMessage.objects.get().status == OutboxMessage.SENT
+
+
+def test_failed_delivery_is_retried(outbox_settings, monkeypatch):
+    mail.send_mail('Тема', 'Текст', 'blog@example.com', ['a@example.com'])
+
+    def refuse(self, messages):
+        raise smtplib.SMTPRecipientsRefused({})
+
+    monkeypatch.setattr(EmailBackend, 'send_messages', refuse)
+    call_command('send_outbox')
+    message = OutboxMessage.objects.get()
+    assert message.status == OutboxMessage.PENDING
+    assert message.attempts == 1
+    assert message.next_attempt_at > message.created_at, (
+        'Убедитесь, что повторная попытка откладывается.'
+    )
+    monkeypatch.undo()
+    call_command('send_outbox')
+    assert mail.outbox == [], (
+        'Убедитесь, что письмо не отправляется раньше времени повтора.'
+    )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def post_selects(queries):
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "blog_post"' in query['sql']
+    ]
+
+
+def test_edit_fetches_post_once(user_client, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f'/posts/{post.pk}/edit/')
+    assert response.status_code == HTTPStatus.OK
+    selects = post_selects(context.captured_queries)
+    assert len(selects) == 1, (
+        'Убедитесь, что публикация читается из базы один раз.'
+    )
+    assert '"blog_post"."body_html"' not in selects[0]
+
+
+def test_edit_saves_without_loading_deferred_fields(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.post(f'/posts/{post.pk}/edit/', {
+            'title': 'Новый заголовок',
+            'text': post.text,
+            'pub_date': post.pub_date.date(),
+            'category': post.category_id,
+        })
+    assert response.status_code == HTTPStatus.FOUND, response.content
+    assert not [
+        sql for sql in post_selects(context.captured_queries)
+        if '"blog_post"."body_html"' in sql
+    ], 'Убедитесь, что отрисованный текст не загружается при сохранении.'
+    post.refresh_from_db()
+    assert post.title == 'Новый заголовок'
+
+
+def test_not_owner_redirected(another_user_client, comment_to_a_post):
+    comment = comment_to_a_post
+    response = another_user_client.get(
+        f'/posts/{comment.post_id}/edit_comment/{comment.pk}/'
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f'/posts/{comment.post_id}/'
+
+
+def test_comment_add_does_not_load_post(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.post(
+            f'/posts/{post.pk}/comment/', {'message': 'Текст'}
+        )
+    assert response.status_code == HTTPStatus.FOUND
+    assert not [
+        sql for sql in post_selects(context.captured_queries)
+        if '"blog_post"."text"' in sql
+    ], 'Убедитесь, что для комментария публикация не загружается целиком.'
+    assert user_client.post(
+        '/posts/0/comment/', {'message': 'Текст'}
+    ).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Post
+from core.paginator import CachedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def eighty_posts(mixer, user, published_category):
+    return mixer.cycle(80).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_page_links_are_elided(client, eighty_posts):
+    response = client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode('utf-8')
+    assert '…' in content
+    assert '?page=5"' not in content, (
+        'Убедитесь, что пагинатор выводит ссылки только на страницы '
+        'рядом с текущей.'
+    )
+    assert '?page=8"' in content
+
+
+def test_stale_count_does_not_truncate_pages(eighty_posts):
+    queryset = Post.objects.order_by('id')
+    CachedCountPaginator(queryset, 10, count_key='posts').count
+    Post.objects.filter(
+        pk__in=[post.pk for post in eighty_posts[:30]]
+    ).delete()
+    # Значение в кеше устарело (80), но страницы строятся по выборке.
+    paginator = CachedCountPaginator(queryset, 10, count_key='posts')
+    assert paginator.count == 80
+    assert len(paginator.page(5).object_list) == 10
+    Post.objects.bulk_create(
+        Post(
+            title='Новая',
+            text='Текст',
+            author=eighty_posts[0].author,
+            pub_date=timezone.now(),
+        )
+        for _ in range(60)
+    )
+    paginator = CachedCountPaginator(queryset, 10, count_key='posts')
+    assert len(paginator.page(11).object_list) == 10, (
+        'Убедитесь, что при запросе страницы за пределами сохранённого '
+        'количества оно пересчитывается.'
+    )
+    assert paginator.count == 110
@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from blog.rendering import render_post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_markdown_is_rendered_and_sanitized(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = (
+        '**Жирный** текст\n<script>alert(1)</script>\n' + 'слово ' * 100
+    )
+    post.save(update_fields=('text',))
+    post.refresh_from_db()
+    assert post.body_html == '', (
+        'Убедитесь, что после изменения текста публикация ждёт отрисовки.'
+    )
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert '&lt;script&gt;' in content
+
+    call_command('render_posts', batch_size=1)
+    post.refresh_from_db()
+    assert '<strong>Жирный</strong>' in post.body_html
+    assert '<script>' not in post.body_html, (
+        'Убедитесь, что HTML из текста публикации очищается.'
+    )
+    assert post.excerpt.startswith('Жирный текст')
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert '<strong>Жирный</strong>' in content
+
+
+def test_unchanged_text_is_not_rerendered(post_with_published_location):
+    post = post_with_published_location
+    call_command('render_posts')
+    post.refresh_from_db()
+    body_html = post.body_html
+    assert body_html
+    post.title = 'Новый заголовок'
+    post.save()
+    assert Post.objects.get(pk=post.pk).body_html == body_html
+
+
+def test_excerpt_is_plain_text(client, post_with_published_location):
+    text = 'Tom & Jerry <3 "кавычки"'
+    excerpt, _ = render_post(text)
+    assert excerpt == text, (
+        'Убедитесь, что в анонсе нет HTML-сущностей: его экранирует шаблон.'
+    )
+    post = post_with_published_location
+    post.text = text
+    post.save(update_fields=('text',))
+    call_command('render_posts')
+    content = client.get('/').content.decode('utf-8')
+    assert 'Tom &amp; Jerry &lt;3' in content
+    assert '&amp;amp;' not in content
@@ -0,0 +1,122 @@
+import os
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import AuthorStats, Comment, Post, Tag
+from blog.purge import hide_post, hide_user, purge_post, remove_images
+from blogicum.constants import MEDIA_GC_GRACE_PERIOD
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def backdate(path):
+    old = os.stat(path).st_mtime - MEDIA_GC_GRACE_PERIOD - 1
+    os.utime(path, (old, old))
+
+
+def test_deleted_post_hidden_then_purged(
+        media_root, mixer, user_client, another_user,
+        post_with_published_location
+):
+    post = post_with_published_location
+    image_path = media_root / post.image.name
+    mixer.cycle(3).blend('blog.Comment', post=post, author=another_user)
+    response = user_client.post(f'/posts/{post.pk}/delete/')
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что удалённая публикация сразу скрывается.'
+    )
+    assert user_client.get(
+        f'/posts/{post.pk}/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert Comment.objects.count() == 3
+    assert os.path.exists(image_path)
+    backdate(image_path)
+    call_command('purge_deleted', batch_size=2)
+    assert not Post.all_objects.exists()
+    assert not Comment.objects.exists()
+    assert not os.path.exists(image_path), (
+        'Убедитесь, что после удаления публикации убирается её изображение.'
+    )
+
+
+def test_deleted_user_hidden_then_purged(
+        media_root, mixer, client, user, another_user,
+        post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=another_user)
+    hidden = mixer.blend(
+        'blog.Post', author=another_user, category=post.category
+    )
+    tag = mixer.blend('blog.Tag')
+    mixer.blend(
+        'blog.PostTag', post=hidden, tag=tag, pub_date=hidden.pub_date
+    )
+    hide_user(another_user)
+    assert not Post.objects.filter(author=another_user).exists()
+    assert Tag.objects.get(pk=tag.pk).post_count == 0, (
+        'Убедитесь, что скрытые публикации не учитываются в счётчике тегов.'
+    )
+    assert AuthorStats.objects.get(user=another_user).post_count == 0, (
+        'Убедитесь, что статистика автора пересчитывается при скрытии '
+        'пользователя.'
+    )
+    response = client.get(f'/posts/{post.pk}/')
+    assert comment not in response.context['comments'], (
+        'Убедитесь, что комментарии удаляемого пользователя скрываются.'
+    )
+    assert client.get(
+        f'/profile/{another_user.username}/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    call_command('purge_deleted')
+    assert not get_user_model().objects.filter(pk=another_user.pk).exists()
+    assert list(Post.all_objects.all()) == [post]
+    assert Tag.objects.get(pk=tag.pk).post_count == 0
+
+
+def test_fresh_image_not_removed(media_root, post_with_published_location):
+    post = post_with_published_location
+    image_path = media_root / post.image.name
+    Post.all_objects.filter(pk=post.pk).delete()
+    assert remove_images([post.image.name]) == 0
+    assert os.path.exists(image_path), (
+        'Убедитесь, что только что загруженный файл не удаляется.'
+    )
+    backdate(image_path)
+    assert remove_images([post.image.name]) == 1
+    assert not os.path.exists(image_path)
+
+
+def test_purge_post_comments_without_per_row_updates(
+        mixer, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(20).blend('blog.Comment', post=post, author=another_user)
+    mixer.blend('blog.Comment', post=post, author=user)
+    hide_post(post)
+    with CaptureQueriesContext(connection) as context:
+        purge_post(post.pk, batch_size=10)
+    updates = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('UPDATE')
+    ]
+    assert len(updates) <= 6, (
+        'Убедитесь, что комментарии вычищаются без UPDATE на каждую строку.'
+    )
+    assert not Comment.objects.exists()
+    assert AuthorStats.objects.get(user=another_user).comment_count == 0, (
+        'Убедитесь, что статистика авторов комментариев пересчитывается.'
+    )
+    assert AuthorStats.objects.get(user=user).comment_count == 0
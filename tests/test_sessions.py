@@ -0,0 +1,76 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+from core import sessions
+
+
+@pytest.fixture(autouse=True)
+def write_behind_sessions(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sessions',
+        },
+    }
+    settings.SESSION_ENGINE = 'core.sessions'
+    settings.SESSION_CACHE_ALIAS = 'sessions'
+
+
+def drain():
+    sessions.writer.submit(lambda: None).result()
+
+
+@pytest.mark.django_db
+def test_anonymous_reader_gets_no_session(client):
+    response = client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    assert not response.cookies, (
+        'Убедитесь, что анонимному читателю не выставляются cookie.'
+    )
+    assert not Session.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_session_written_behind(client, django_user_model):
+    user = django_user_model.objects.create_user('reader', password='pass')
+    client.force_login(user)
+    drain()
+    session = Session.objects.get()
+    assert session.get_decoded()['_auth_user_id'] == str(user.pk), (
+        'Убедитесь, что сессия сохраняется в базе в фоне.'
+    )
+    Session.objects.all().delete()
+    response = client.get('/')
+    assert response.context['user'] == user, (
+        'Убедитесь, что сессия читается из кеша.'
+    )
+    client.logout()
+    drain()
+    assert not Session.objects.exists()
+
+
+@pytest.mark.django_db
+def test_sweeper_deletes_only_expired():
+    now = timezone.now()
+    Session.objects.bulk_create(
+        Session(
+            session_key=f'expired{number}',
+            session_data='',
+            expire_date=now - timedelta(days=1),
+        )
+        for number in range(5)
+    )
+    Session.objects.create(
+        session_key='alive', session_data='',
+        expire_date=now + timedelta(days=1),
+    )
+    call_command('sweep_sessions', batch_size=2)
+    assert list(
+        Session.objects.values_list('session_key', flat=True)
+    ) == ['alive']
@@ -0,0 +1,94 @@
+import gzip
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import SitemapShard
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def sitemap_root(settings, tmp_path):
+    settings.SITEMAP_ROOT = tmp_path
+    return tmp_path
+
+
+def read_shard(root, kind):
+    with gzip.open(root / f'sitemap-{kind}-0.xml.gz') as file:
+        return file.read().decode('utf-8')
+
+
+def test_sitemap_lists_published_posts(
+    client, sitemap_root, post_with_published_location, future_posts
+):
+    call_command('build_sitemaps')
+    content = read_shard(sitemap_root, SitemapShard.POSTS)
+    assert f'/posts/{post_with_published_location.id}/' in content
+    for post in future_posts:
+        assert f'/posts/{post.id}/' not in content, (
+            'Убедитесь, что отложенные публикации не попадают в карту сайта.'
+        )
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK
+    assert 'sitemaps/sitemap-posts-0.xml.gz' in b''.join(
+        response.streaming_content
+    ).decode('utf-8')
+    response = client.get('/sitemaps/sitemap-posts-0.xml.gz')
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == 'application/gzip'
+
+
+def test_only_dirty_shards_are_rebuilt(
+    sitemap_root, post_with_published_location
+):
+    call_command('build_sitemaps')
+    assert not SitemapShard.objects.filter(is_dirty=True).exists()
+    post_with_published_location.title = 'Новый заголовок'
+    post_with_published_location.save()
+    dirty = SitemapShard.objects.filter(is_dirty=True)
+    assert list(dirty.values_list('kind', flat=True)) == [
+        SitemapShard.POSTS
+    ], 'Убедитесь, что изменение публикации помечает только её часть.'
+    call_command('build_sitemaps')
+    assert not dirty.exists()
+
+
+def test_scheduled_post_appears_after_pub_date(
+    sitemap_root, post_with_published_location, future_posts
+):
+    call_command('build_sitemaps')
+    post = future_posts[0]
+    SitemapShard.objects.update(
+        generated_at=timezone.now() - timedelta(days=1)
+    )
+    post.__class__.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command('build_sitemaps')
+    assert f'/posts/{post.id}/' in read_shard(
+        sitemap_root, SitemapShard.POSTS
+    )
+
+
+def test_unpublished_category_hides_its_posts(
+    mixer, sitemap_root, post_with_published_location, another_category
+):
+    other = mixer.blend(
+        'blog.Post', category=another_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    call_command('build_sitemaps')
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    call_command('build_sitemaps')
+    content = read_shard(sitemap_root, SitemapShard.POSTS)
+    assert f'/posts/{other.id}/' in content
+    assert f'/posts/{post_with_published_location.id}/' not in content, (
+        'Убедитесь, что снятие категории с публикации обновляет части '
+        'карты сайта с её публикациями.'
+    )
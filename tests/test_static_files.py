@@ -0,0 +1,56 @@
+import gzip
+
+import brotli
+import pytest
+
+from core.storage import CompressedManifestStaticFilesStorage
+
+CSS = b'body { margin: 0; }\n' * 50
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    return tmp_path
+
+
+def test_post_process_writes_compressed_copies(static_root):
+    (static_root / 'app.css').write_bytes(CSS)
+    storage = CompressedManifestStaticFilesStorage(location=str(static_root))
+    list(storage.post_process({'app.css': (storage, 'app.css')}))
+    hashed = static_root / storage.hashed_files['app.css']
+    assert gzip.decompress(
+        (static_root / f'{hashed}.gz').read_bytes()
+    ) == CSS, 'Убедитесь, что collectstatic сохраняет копию в gzip.'
+    assert brotli.decompress(
+        (static_root / f'{hashed}.br').read_bytes()
+    ) == CSS, 'Убедитесь, что collectstatic сохраняет копию в brotli.'
+
+
+def test_missing_manifest_entry_is_an_error(settings, static_root):
+    settings.STATIC_MANIFEST_STRICT = True
+    storage = CompressedManifestStaticFilesStorage(location=str(static_root))
+    with pytest.raises(ValueError):
+        storage.stored_name('missing.css')
+    settings.STATIC_MANIFEST_STRICT = False
+    assert storage.stored_name('missing.css') == 'missing.css'
+
+
+@pytest.mark.parametrize('accept_encoding, expected', (
+    ('gzip, br', 'br'),
+    ('gzip, br;q=0', 'gzip'),
+    ('identity', None),
+))
+def test_static_encoding_negotiation(
+        client, static_root, accept_encoding, expected
+):
+    (static_root / 'app.css').write_bytes(CSS)
+    (static_root / 'app.css.gz').write_bytes(gzip.compress(CSS))
+    (static_root / 'app.css.br').write_bytes(brotli.compress(CSS))
+    response = client.get(
+        '/static/app.css', HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    assert response.get('Content-Encoding') == expected, (
+        'Убедитесь, что сжатая копия выбирается по Accept-Encoding.'
+    )
+    assert response['Vary'] == 'Accept-Encoding'
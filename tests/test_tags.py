@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from blog.models import PostTag, Tag
+from blog.tags import tag_cloud
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_tag_counts_follow_assignments(
+    post_with_published_location, post_with_another_category
+):
+    first, second = post_with_published_location, post_with_another_category
+    PostTag.objects.assign(first, ['Горы', 'Море'])
+    PostTag.objects.assign(second, ['горы'])
+    assert dict(Tag.objects.values_list('slug', 'post_count')) == {
+        'горы': 2, 'море': 1,
+    }, 'Убедитесь, что счётчик тега меняется при назначении тегов.'
+    PostTag.objects.assign(first, ['Море'])
+    second.delete()
+    assert dict(Tag.objects.values_list('slug', 'post_count')) == {
+        'горы': 0, 'море': 1,
+    }, 'Убедитесь, что счётчик тега уменьшается при снятии тега.'
+
+
+def test_tag_cloud_is_cached(
+    django_assert_num_queries, post_with_published_location
+):
+    PostTag.objects.assign(post_with_published_location, ['Горы'])
+    assert [tag['slug'] for tag in tag_cloud()] == ['горы']
+    with django_assert_num_queries(0):
+        tag_cloud()
+    PostTag.objects.assign(post_with_published_location, ['Море'])
+    assert [tag['slug'] for tag in tag_cloud()] == ['море']
+
+
+def test_tag_page_and_form(
+    user_client, post_with_published_location, future_posts
+):
+    post = post_with_published_location
+    PostTag.objects.assign(post, ['Горы'])
+    PostTag.objects.assign(future_posts[0], ['Горы'])
+    response = user_client.get('/tags/горы/')
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['page_obj']) == [post], (
+        'Убедитесь, что на странице тега только опубликованные записи.'
+    )
+    response = user_client.get(f'/posts/{post.id}/edit/')
+    assert response.context['form']['tags'].initial == 'Горы'
+
+
+def test_tag_cloud_shows_only_visible_posts(
+    post_with_published_location, future_posts, posts_with_unpublished_category
+):
+    PostTag.objects.assign(post_with_published_location, ['Горы'])
+    PostTag.objects.assign(future_posts[0], ['Секрет'])
+    PostTag.objects.assign(posts_with_unpublished_category[0], ['Черновик'])
+    assert [tag['slug'] for tag in tag_cloud()] == ['горы'], (
+        'Убедитесь, что в облако не попадают теги, которые есть только '
+        'у неопубликованных записей.'
+    )
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert tag_cloud() == [], (
+        'Убедитесь, что облако обновляется при снятии записи с публикации.'
+    )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+
+from blogicum.constants import LOGIN_USERNAME_LIMIT
+from core import throttle
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_counters():
+    caches[throttle.CACHE_ALIAS].clear()
+    yield
+    caches[throttle.CACHE_ALIAS].clear()
+
+
+def test_login_throttled_before_authentication(client, user, admin_client):
+    attempts = []
+
+    def receiver(**kwargs):
+        attempts.append(kwargs['credentials']['username'])
+
+    user_login_failed.connect(receiver)
+    try:
+        data = {'username': user.username, 'password': 'wrong'}
+        for _ in range(LOGIN_USERNAME_LIMIT):
+            assert client.post(
+                '/auth/login/', data
+            ).status_code == HTTPStatus.OK
+        response = client.post('/auth/login/', data)
+    finally:
+        user_login_failed.disconnect(receiver)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response['Retry-After']) > 0
+    assert len(attempts) == LOGIN_USERNAME_LIMIT, (
+        'Убедитесь, что лишняя попытка отклоняется до проверки пароля.'
+    )
+    assert client.post(
+        '/auth/login/', {'username': 'other', 'password': 'wrong'}
+    ).status_code == HTTPStatus.OK
+    metrics = admin_client.get('/metrics/throttle/').json()
+    assert metrics['login']['rejected'] == 1
+    assert metrics['login']['username_limit'] == LOGIN_USERNAME_LIMIT
+
+
+def test_successful_logins_do_not_lock_username(client, django_user_model):
+    django_user_model.objects.create_user('reader', password='pass')
+    data = {'username': 'reader', 'password': 'pass'}
+    for _ in range(LOGIN_USERNAME_LIMIT + 1):
+        assert client.post('/auth/login/', data).status_code == (
+            HTTPStatus.FOUND
+        ), 'Убедитесь, что удачные попытки входа не исчерпывают лимит.'